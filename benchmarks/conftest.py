@@ -0,0 +1,91 @@
+import pytest
+import datetime
+import random
+import toml
+from rotafy.api import manager
+
+
+RECURRENCES = [
+    "daily",
+    "weekdays",
+    "saturdays",
+    "sundays",
+    "every other monday",
+    "tuesdays and thursdays",
+]
+
+
+def generate_config(
+    num_people: int,
+    num_chores: int,
+    lookahead_days: int = 28,
+    unavailable_rate: float = 0.1,
+    seed: int = 0,
+) -> dict:
+    rng = random.Random(seed)
+    today = datetime.date.today()
+
+    chores = []
+    for i in range(num_chores):
+        chores.append(
+            {
+                "name": f"Chore {i}",
+                "recurrence": RECURRENCES[i % len(RECURRENCES)],
+                "notify": 1 + (i % 3),
+            }
+        )
+
+    chore_names = [c["name"] for c in chores]
+    people = []
+    for i in range(num_people):
+        skills = rng.sample(chore_names, k=rng.randint(1, num_chores))
+        untrained = [c for c in chore_names if c not in skills]
+        training = rng.sample(untrained, k=min(len(untrained), 1))
+        unavailable = [
+            today + datetime.timedelta(days=d)
+            for d in range(lookahead_days + 1)
+            if rng.random() < unavailable_rate
+        ]
+        people.append(
+            {
+                "name": f"Person {i}",
+                "telephone": f"+6140000{i:04d}",
+                "skills": skills,
+                "training": training,
+                "unavailable": unavailable,
+            }
+        )
+
+    return {
+        "name": f"benchmark_{num_people}_{num_chores}_{lookahead_days}",
+        "lookahead_days": lookahead_days,
+        "clicksend_username": "test1@test.com",
+        "clicksend_api_key": "D83DED51-9E35-4D42-9BB9-0E34B7CA85AE",
+        "chore": chores,
+        "person": people,
+    }
+
+
+def write_config(directory, **kwargs) -> str:
+    data = generate_config(**kwargs)
+    file_path = str(directory / f"{data['name']}.toml")
+    with open(file_path, "w") as f:
+        toml.dump(data, f)
+
+    return file_path
+
+
+@pytest.fixture(params=[(5, 2), (20, 6)], ids=lambda p: f"{p[0]}people-{p[1]}chores")
+def config_file(request, tmp_path):
+    num_people, num_chores = request.param
+    return write_config(tmp_path, num_people=num_people, num_chores=num_chores)
+
+
+@pytest.fixture
+def long_config_file(tmp_path):
+    return write_config(tmp_path, num_people=10, num_chores=4, lookahead_days=365)
+
+
+@pytest.fixture
+def filled_manager(config_file, tmp_path):
+    return manager.Manager(config_file, str(tmp_path / "rotas"))
@@ -0,0 +1,41 @@
+import os
+from rotafy.api import manager
+
+
+def _clear_rota(m):
+    def setup():
+        if os.path.exists(m.rota.file_path):
+            os.remove(m.rota.file_path)
+
+    return setup
+
+
+def test_construction(benchmark, config_file, tmp_path):
+    rota_directory = str(tmp_path / "rotas")
+    m = manager.Manager(config_file, rota_directory)
+    benchmark.pedantic(
+        manager.Manager,
+        args=(config_file, rota_directory),
+        setup=_clear_rota(m),
+        rounds=5,
+    )
+
+
+def test_fill_long_lookahead(benchmark, long_config_file, tmp_path):
+    m = manager.Manager(long_config_file, str(tmp_path / "rotas"))
+
+    def setup():
+        m.rota.rows = []
+        m.rota.save()
+
+    benchmark.pedantic(m.fill, setup=setup, rounds=3)
+
+
+def test_row_weight(benchmark, filled_manager):
+    latest_row = filled_manager.rota.rows[-1]
+    benchmark(filled_manager.row_weight, latest_row)
+
+
+def test_row_weights_vectorised(benchmark, filled_manager):
+    latest_row = filled_manager.rota.rows[-1]
+    benchmark(filled_manager.row_weights_vectorised, [latest_row] * 100)
@@ -0,0 +1,81 @@
+import datetime
+import json
+import os
+from types import SimpleNamespace
+from rotafy.api import notifier, transport
+
+
+def _stub_clicksend(m):
+    # Only the HTTP request is stubbed, so the SMSApi still serialises every
+    # message and the transport still parses the response.
+    def post(url, body=None, **kwargs):
+        statuses = [
+            {"custom_string": sms["custom_string"], "status": "SUCCESS"}
+            for sms in body["messages"]
+        ]
+        response = {"response_code": "SUCCESS", "data": {"messages": statuses}}
+        return SimpleNamespace(data=json.dumps(response).encode())
+
+    clicksend = transport.ClickSendTransport("test1@test.com", "api_key")
+    clicksend.clicksend_api.api_client.rest_client = SimpleNamespace(POST=post)
+    m.notifier.transport = clicksend
+
+
+def _reset_notifications(m):
+    for r in m.rota.rows:
+        for a in r.assignments:
+            a.notification_sent = False
+
+    m.rota.sort()
+    if os.path.exists(m.rota.outbox_path):
+        os.remove(m.rota.outbox_path)
+
+
+def test_notify(benchmark, filled_manager):
+    _stub_clicksend(filled_manager)
+    benchmark.pedantic(
+        filled_manager.notify,
+        setup=lambda: _reset_notifications(filled_manager),
+        rounds=5,
+    )
+    assert len(filled_manager.outbox.entries) > 0
+    assert len(filled_manager.outbox.unsent()) == 0
+
+
+def test_notify_in_memory(benchmark, filled_manager):
+    filled_manager.notifier.transport = transport.MemoryTransport()
+    benchmark.pedantic(
+        filled_manager.notify,
+        setup=lambda: _reset_notifications(filled_manager),
+        rounds=5,
+    )
+
+
+def test_notify_to_file(benchmark, filled_manager, tmp_path):
+    filled_manager.notifier.transport = transport.FileTransport(
+        str(tmp_path / "messages.jsonl")
+    )
+    benchmark.pedantic(
+        filled_manager.notify,
+        setup=lambda: _reset_notifications(filled_manager),
+        rounds=5,
+    )
+
+
+def test_simulated_round(benchmark, filled_manager):
+    # Queues and sends a reminder for every assignment in the rota at once.
+    n = notifier.Notifier(
+        transport.MemoryTransport(), filled_manager.configuration.message_template
+    )
+    today = datetime.date.today()
+    assignments = [
+        a for r in filled_manager.rota.rows for a in r.assignments if a.date >= today
+    ]
+
+    def notify_all():
+        for a in assignments:
+            n.message_from_assignment(a)
+
+        n.send()
+
+    benchmark(notify_all)
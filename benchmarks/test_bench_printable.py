@@ -0,0 +1,12 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+
+def test_dataframe(benchmark, filled_manager):
+    benchmark(lambda: filled_manager.rota.dataframe)
+
+
+def test_pdf(benchmark, filled_manager, tmp_path):
+    output_file = str(tmp_path / "rota.pdf")
+    benchmark.pedantic(filled_manager.rota.pdf, args=(output_file,), rounds=3)
@@ -0,0 +1,18 @@
+import pytest
+from rotafy.rota import rota
+
+
+@pytest.fixture
+def copied_rota(filled_manager, tmp_path):
+    r = rota.Rota("copied_rota", str(tmp_path))
+    r.rows = filled_manager.rota.rows
+    r.save()
+    return r
+
+
+def test_save(benchmark, copied_rota):
+    benchmark(copied_rota.save)
+
+
+def test_load(benchmark, copied_rota):
+    benchmark(copied_rota.load)
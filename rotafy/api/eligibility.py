@@ -0,0 +1,63 @@
+import datetime
+from typing import Iterable
+from rotafy.config import chore, person
+
+
+class EligibilityIndex:
+    def __init__(
+        self, people: Iterable[person.Person], chores: Iterable[chore.Chore]
+    ) -> None:
+        # Each person is a bit in an int, in name order, so decoding a bitset
+        # gives people in a stable order.
+        self.people = sorted(people, key=lambda p: p.name)
+        self.chores = set(chores)
+        self._positions = {p: i for i, p in enumerate(self.people)}
+        self._everyone = (1 << len(self.people)) - 1
+
+        self.qualified = {c: 0 for c in self.chores}
+        self.learning = {c: 0 for c in self.chores}
+        for p in self.people:
+            self.update(p)
+
+        self.unavailable = {}
+        for p in self.people:
+            bit = 1 << self._positions[p]
+            for date in p.unavailable:
+                self.unavailable[date] = self.unavailable.get(date, 0) | bit
+
+    def update(self, person_to_update: person.Person) -> None:
+        # People who are no longer configured are not in the index.
+        if person_to_update not in self._positions:
+            return
+
+        bit = 1 << self._positions[person_to_update]
+        for c in self.chores:
+            if person_to_update.qualified(c):
+                self.qualified[c] |= bit
+            else:
+                self.qualified[c] &= ~bit
+
+            if person_to_update.is_learning(c):
+                self.learning[c] |= bit
+            else:
+                self.learning[c] &= ~bit
+
+    def available(self, date: datetime.date) -> int:
+        return self._everyone & ~self.unavailable.get(date, 0)
+
+    def can_do(self, chore: chore.Chore, date: datetime.date) -> list[person.Person]:
+        return self._decode(self.qualified.get(chore, 0) & self.available(date))
+
+    def can_be_trained(
+        self, chore: chore.Chore, date: datetime.date
+    ) -> list[person.Person]:
+        return self._decode(self.learning.get(chore, 0) & self.available(date))
+
+    def _decode(self, bits: int) -> list[person.Person]:
+        people = []
+        while bits:
+            lowest_bit = bits & -bits
+            people.append(self.people[lowest_bit.bit_length() - 1])
+            bits ^= lowest_bit
+
+        return people
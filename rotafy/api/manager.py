@@ -1,17 +1,25 @@
+import contextlib
 import datetime
 import logging
 import itertools
-from typing import Iterable
+import functools
+from typing import Iterable, Iterator
 import random
 from retry.api import retry_call
 from clicksend_client.rest import ApiException
 from rotafy.config import config, chore, person
-from rotafy.rota import printable, assignment, row
-from rotafy.api import notifier
+from rotafy.rota import printable, overlay, assignment, records, row
+from rotafy.api import eligibility, notifier, outbox, profiling, scoring, transport
 
 
 logger = logging.getLogger(__name__)
 
+# Each round of notifications is tried this many times, waiting NOTIFY_DELAY
+# seconds after the first failure and NOTIFY_BACKOFF times longer each time.
+NOTIFY_TRIES = 3
+NOTIFY_DELAY = 5
+NOTIFY_BACKOFF = 5
+
 
 class DateNotFound(Exception):
     def __init__(self, date: datetime.date) -> None:
@@ -44,24 +52,62 @@ class NoValidAssignments(Exception):
         super().__init__(f"Cannot find any valid assignments on {date}.")
 
 
+def _locked(method):
+    # Hold the rota's file lock for the whole load, mutate and save cycle.
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.rota.lock():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class Manager:
-    def __init__(self, toml_file_path: str) -> None:
+    @profiling.timed("init")
+    def __init__(
+        self,
+        toml_file_path: str,
+        rota_directory: str | None = None,
+        dry_run: bool = False,
+        seed: int | None = None,
+    ) -> None:
         self.configuration = config.Config(toml_file_path)
         self.name = self.configuration.name
 
         logger.info(f"Creating rotafy.Manager named {self.name}")
         logger.info(f"Loaded configuration file from {toml_file_path}")
 
-        self.rota = printable.PrintableRota(self.name)
+        if rota_directory is None:
+            rota_directory = self.configuration.rota_directory
+
+        self.dry_run = dry_run
+        self._eligibility = None
+        self._batch_depth = 0
+        self._batch_modified = False
+        self.seed = seed
+        if self.seed is None:
+            self.seed = self.configuration.seed
+
+        self.random = random.Random(self.seed)
+        self.rota = printable.PrintableRota(self.name, rota_directory)
+        if self.dry_run:
+            logger.info("Dry run, changes to the rota will not be saved")
+            self.rota = overlay.OverlayRota(self.rota)
         self.notifier = notifier.Notifier(
-            self.configuration.clicksend_username,
-            self.configuration.clicksend_api_key,
+            transport.from_config(self.configuration),
             self.configuration.message_template,
         )
-        self.update_chores()
-        self.update_people()
+        self.outbox = outbox.Outbox(self.rota.outbox_path)
 
-        self.check_and_heal()
+        with self.rota.lock():
+            if self.rota.is_stale():
+                self.rota.load()
+                self.rota.sort()
+
+            self.update_chores()
+            self.update_people()
+
+            self.check_and_heal()
 
     def print(self) -> None:
         self.rota.print()
@@ -69,12 +115,98 @@ class Manager:
     def print_path(self) -> None:
         print(self.rota.file_path)
 
+    def plan(self) -> list[tuple[datetime.date, row.Row | None, row.Row | None]]:
+        if not self.dry_run:
+            return []
+
+        return self.rota.diff()
+
+    def print_plan(self) -> None:
+        print(overlay.describe_diff(self.plan()))
+
     def to_pdf(self, output_file: str) -> None:
         self.rota.pdf(output_file)
 
+    @profiling.timed("save")
+    def _save(self) -> None:
+        if self._batch_depth > 0:
+            self._batch_modified = True
+            return
+
+        profiling.count("saves")
+        self.rota.save()
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        # Changes made inside a batch are saved once when it ends, or all rolled
+        # back if anything in it fails. Nested batches join the outermost one.
+        if self._batch_depth > 0:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+
+            return
+
+        with self.rota.lock(), self.rota.journal():
+            people = {
+                p: (dict(p.experience), set(p.skills))
+                for p in self.configuration.people
+            }
+
+            self._batch_depth = 1
+            self._batch_modified = False
+            try:
+                yield
+                self._batch_depth = 0
+                if self._batch_modified:
+                    self._save()
+            except BaseException:
+                # The rota's journal restores the rows it touched.
+                logger.info("Rolling back changes to %s", self.name)
+                for p, (experience, skills) in people.items():
+                    p.experience = experience
+                    p.skills = skills
+                    if self._eligibility is not None:
+                        self._eligibility.update(p)
+
+                raise
+            finally:
+                self._batch_depth = 0
+                self._batch_modified = False
+
+    @property
+    def eligibility(self) -> eligibility.EligibilityIndex:
+        # Built once, on first use, then kept up to date as people's skills and
+        # training change through the methods below.
+        if self._eligibility is None:
+            self._eligibility = eligibility.EligibilityIndex(
+                self.configuration.people, self.configuration.chores
+            )
+
+        return self._eligibility
+
+    def _add_to_experience(
+        self, trainee: person.Person, trained_chore: chore.Chore, sessions: int = 1
+    ) -> None:
+        trainee.add_to_experience(trained_chore, sessions)
+        if self._eligibility is not None:
+            self._eligibility.update(trainee)
+
+    def _reduce_experience(
+        self, trainee: person.Person, trained_chore: chore.Chore
+    ) -> None:
+        trainee.reduce_experience(trained_chore)
+        if self._eligibility is not None:
+            self._eligibility.update(trainee)
+
     def chores_on(self, date: datetime.date) -> Iterable[chore.Chore]:
+        profiling.count("rrule_queries", len(self.configuration.chores))
         found_chores = set(c for c in self.configuration.chores if c.on(date))
-        logger.info(f"Found chores on {date}: {[c.name for c in found_chores]}")
+        if logger.isEnabledFor(logging.INFO):
+            chore_names = [c.name for c in found_chores]
+            logger.info("Found chores on %s: %s", date, chore_names)
         return found_chores
 
     def update_chores(self):
@@ -102,16 +234,33 @@ class Manager:
                         a.trainee = person.find_person(
                             a.trainee.name, self.configuration.people
                         )
-                        a.trainee.add_to_experience(a.chore)
                     except person.PersonNotFound:
                         continue
 
+        # Experience comes from the training counters saved with the rota rather
+        # than replaying every training session in the history.
+        for trainee_name, sessions_per_chore in self.rota.training.items():
+            try:
+                trainee = person.find_person(trainee_name, self.configuration.people)
+            except person.PersonNotFound:
+                continue
+
+            for chore_name, sessions in sessions_per_chore.items():
+                try:
+                    trained_chore = chore.find_chore(
+                        chore_name, self.configuration.chores
+                    )
+                except chore.ChoreNotFound:
+                    continue
+
+                self._add_to_experience(trainee, trained_chore, sessions)
+
     def find_assignment(
         self, date: datetime.date, person_name: str
     ) -> None | assignment.Assignment:
         existing_row = self.rota[date]
         if existing_row is None:
-            logger.info(f"No existing row on {date}")
+            logger.info("No existing row on %s", date)
             return None
 
         person_assignment = [
@@ -121,12 +270,13 @@ class Manager:
             or (a.trainee is not None and a.trainee.name == person_name)
         ]
         if len(person_assignment) != 1:
-            logger.info(f"No existing assignment for {person_name} on {date}")
+            logger.info("No existing assignment for %s on %s", person_name, date)
             return None
 
-        logger.info(f"Found existing assignment for {person_name} on {date}")
+        logger.info("Found existing assignment for %s on %s", person_name, date)
         return person_assignment[0]
 
+    @_locked
     def remove_person(self, date: datetime.date, person_name: str) -> None:
         existing_row = self.rota[date]
         if existing_row is None:
@@ -145,7 +295,7 @@ class Manager:
             person_assignment.trainee is not None
             and person_assignment.trainee.name == person_name
         ):
-            person_assignment.trainee.reduce_experience(person_assignment.chore)
+            self._reduce_experience(person_assignment.trainee, person_assignment.chore)
             person_assignment.trainee = None
             new_row[person_assignment.chore] = person_assignment
         else:
@@ -156,8 +306,9 @@ class Manager:
         else:
             self.rota[date] = new_row
 
-        self.rota.save()
+        self._save()
 
+    @_locked
     def add_person(
         self, date: datetime.date, chore_name: str, person_name: str
     ) -> None:
@@ -175,8 +326,9 @@ class Manager:
             new_row[chore_to_do] = new_assignment
 
         self.rota[date] = new_row
-        self.rota.save()
+        self._save()
 
+    @_locked
     def add_trainee(
         self, date: datetime.date, chore_name: str, person_name: str
     ) -> None:
@@ -194,9 +346,10 @@ class Manager:
             raise ChoreNotAssigned(date, chore_name)
 
         existing_assignment.trainee = trainee_to_assign
-        self.rota[date][chore_to_do] = existing_assignment
-        self.rota.save()
+        self.rota.set_assignment(existing_assignment)
+        self._save()
 
+    @_locked
     def swap(self, date: datetime.date, person1_name: str, person2_name: str) -> None:
         existing_row = self.rota[date]
         if existing_row is None:
@@ -220,15 +373,17 @@ class Manager:
         if person2_assignment.trainee is not None:
             person2_assigned_as_trainee = person2_assignment.trainee.name == person2_name
 
-        self.remove_person(date, person1_name)
-        self.remove_person(date, person2_name)
+        with self.batch():
+            self.remove_person(date, person1_name)
+            self.remove_person(date, person2_name)
 
-        if not (person1_assigned_as_trainee):
-            self.add_person(date, person1_assignment.chore.name, person2_name)
+            if not (person1_assigned_as_trainee):
+                self.add_person(date, person1_assignment.chore.name, person2_name)
 
-        if not (person2_assigned_as_trainee):
-            self.add_person(date, person2_assignment.chore.name, person1_name)
+            if not (person2_assigned_as_trainee):
+                self.add_person(date, person2_assignment.chore.name, person1_name)
 
+    @_locked
     def replace(
         self, date: datetime.date, person_name: str, replacement_name: str
     ) -> None:
@@ -242,9 +397,12 @@ class Manager:
         if existing_assignment is None:
             raise PersonNotAssigned(date, person_name)
 
-        self.remove_person(date, person_name)
-        self.add_person(date, existing_assignment.chore.name, replacement_name)
+        with self.batch():
+            self.remove_person(date, person_name)
+            self.add_person(date, existing_assignment.chore.name, replacement_name)
 
+    @_locked
+    @profiling.timed("check_and_heal")
     def check_and_heal(self):
         # Remove all chores that no longer should be carried out and assigned people
         # that are no longer available.
@@ -263,7 +421,7 @@ class Manager:
                     if len([_ for _ in row.assignments if _.chore != a.chore]) == 0:
                         del self.rota[row.date]
                     else:
-                        del self.rota[row.date][a.chore]
+                        self.rota.delete_assignment(row.date, a.chore)
 
                 updated_person = None
                 try:
@@ -277,7 +435,7 @@ class Manager:
                     if len([_ for _ in row.assignments if _.chore != a.chore]) == 0:
                         del self.rota[row.date]
                     else:
-                        del self.rota[row.date][a.chore]
+                        self.rota.delete_assignment(row.date, a.chore)
 
                 updated_trainee = None
                 if a.trainee is not None:
@@ -289,11 +447,14 @@ class Manager:
                         logger.info(
                             f"Removing {a.trainee.name} as trainee from {a.date} - no longer configured"
                         )
-                        a.trainee.reduce_experience(a.chore)
+                        self._reduce_experience(a.trainee, a.chore)
                         a.trainee = None
-                        self.rota[row.date][a.chore] = a
+                        self.rota.set_assignment(a)
                         updated_trainee = None
 
+                if updated_chore is not None:
+                    profiling.count("rrule_queries")
+
                 if (
                     updated_chore is not None and 
                     updated_person is not None and (
@@ -311,7 +472,7 @@ class Manager:
                     if len([_ for _ in row.assignments if _.chore != a.chore]) == 0:
                         del self.rota[row.date]
                     else:
-                        del self.rota[row.date][a.chore]
+                        self.rota.delete_assignment(row.date, a.chore)
                 else:
                     if (
                         updated_trainee is not None
@@ -320,39 +481,83 @@ class Manager:
                         logger.info(
                             f"Removing {a.trainee.name} - no longer available on {a.date}"
                         )
-                        a.trainee.reduce_experience(a.chore)
+                        self._reduce_experience(a.trainee, a.chore)
                         a.trainee = None
-                        self.rota[row.date][a.chore] = a
+                        self.rota.set_assignment(a)
 
         self.fill()
 
     def all_independently_valid_assignments(
-        self, date: datetime.date, chore_to_assign: chore.Chore
+        self,
+        date: datetime.date,
+        chore_to_assign: chore.Chore,
+        excluded_people: Iterable[person.Person] = (),
     ) -> Iterable[assignment.Assignment]:
+        return [
+            assignment.Assignment(date, chore_to_assign, p, t)
+            for p, t in self.valid_choices(date, chore_to_assign, excluded_people)
+        ]
+
+    @profiling.timed("all_independently_valid_assignments")
+    def valid_choices(
+        self,
+        date: datetime.date,
+        chore_to_assign: chore.Chore,
+        excluded_people: Iterable[person.Person] = (),
+    ) -> list[tuple[person.Person, person.Person | None]]:
+        # (person, trainee) pairs that could be assigned the chore. The index
+        # orders people by name so that a seeded fill makes the same choices
+        # regardless of set ordering.
+        index = self.eligibility
+
+        # Leaving out people who are already busy on this date means every
+        # candidate can join the rest of the row without failing validation.
+        excluded_people = set(excluded_people)
         valid_people = [
-            p for p in self.configuration.people if p.can_do(chore_to_assign, date)
+            p for p in index.can_do(chore_to_assign, date) if p not in excluded_people
         ]
         valid_trainees = [None] + [
             t
-            for t in self.configuration.people
-            if t.can_be_trained(chore_to_assign, date)
+            for t in index.can_be_trained(chore_to_assign, date)
+            if t not in excluded_people
         ]
-        valid_assignments = []
-        for p, t in itertools.product(valid_people, valid_trainees):
-            new_assignment = assignment.Assignment(date, chore_to_assign, p, t)
-            valid_assignments.append(new_assignment)
+        choices = list(itertools.product(valid_people, valid_trainees))
+        profiling.count("candidate_assignments", len(choices))
 
-        logging.info(
-            f"Found valid assignments for {chore_to_assign.name} on {date}: {[str(a) for a in valid_assignments]}"
-        )
-        return valid_assignments
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Found valid assignments for %s on %s: %s",
+                chore_to_assign.name,
+                date,
+                [(p.name, None if t is None else t.name) for p, t in choices],
+            )
 
-    def row_weight(self, row_to_check: row.Row) -> float:
-        date = row_to_check.date
+        return choices
+
+    def recent_rows(self, date: datetime.date) -> list[row.Row]:
         previous_rows = self.rota.rows_prior(date)
         previous_rows.reverse()
-        max_look_back = 10
-        previous_rows = [r for i, r in enumerate(previous_rows) if i < max_look_back]
+        return previous_rows[: scoring.MAX_LOOK_BACK]
+
+    @profiling.timed("row_weight")
+    def row_weight(self, row_to_check: row.Row) -> float:
+        previous_rows = self.recent_rows(row_to_check.date)
+        weight = self.assignments_weight(previous_rows, row_to_check.assignments)
+
+        if logger.isEnabledFor(logging.INFO):
+            row_s = [f"{a.chore.name}: {str(a)}" for a in row_to_check.assignments]
+            logger.info("Weight of %s calculated for %s", weight, ", ".join(row_s))
+
+        return weight
+
+    def assignments_weight(
+        self,
+        previous_rows: Iterable[row.Row],
+        assignments: Iterable[assignment.Assignment],
+    ) -> float:
+        # previous_rows are the most recent rows, working backwards, as given by
+        # recent_rows.
+        max_look_back = scoring.MAX_LOOK_BACK
 
         # For each person, working from most recent row to least recent row, we
         # will subtract the following from the weight.
@@ -365,7 +570,7 @@ class Manager:
         # = very close to but never > 1
         weight = len(self.configuration.chores)
 
-        for assignment_to_check in row_to_check.assignments:
+        for assignment_to_check in assignments:
             n = 0
             for comparison_row in previous_rows:
                 same_chore_assignment = [
@@ -394,15 +599,29 @@ class Manager:
                             weight -= 1 / ((2**n) * 2)
                             break
 
-        row_s = [f"{a.chore.name}: {str(a)}" for a in row_to_check.assignments]
-        logger.info(f"Weight of {weight} calculated for {', '.join(row_s)}")
         return weight
 
+    @profiling.timed("row_weights_vectorised")
+    def row_weights_vectorised(self, rows_to_check: Iterable[row.Row]) -> list[float]:
+        rows_to_check = list(rows_to_check)
+        if len(rows_to_check) == 0:
+            return []
+
+        # NumPy is only imported when vectorised scoring is used.
+        from rotafy.api import vectorised
+
+        previous_rows = self.recent_rows(rows_to_check[0].date)
+        return vectorised.row_weights(
+            previous_rows,
+            [r.assignments for r in rows_to_check],
+            len(self.configuration.chores),
+        )
+
+    @profiling.timed("assign_chores_on")
     def assign_chores_on(self, date: datetime.date) -> None:
-        # TODO: Add dry-run option.
         chores_on_date = self.chores_on(date)
         if len(chores_on_date) == 0:
-            logger.info(f"No chores on {date} to assign")
+            logger.info("No chores on %s to assign", date)
             return
 
         existing_row = self.rota[date]
@@ -412,10 +631,11 @@ class Manager:
 
         existing_assignments = [a for a in existing_assignments if a is not None]
         existing_chores = [a.chore for a in existing_assignments]
-        logger.info(f"Existing chores already assigned on {date}: {existing_chores}")
+        logger.info("Existing chores already assigned on %s: %s", date, existing_chores)
 
         chores_to_assign = [c for c in chores_on_date if c not in existing_chores]
-        logger.info(f"New assignments required on {date} for {chores_to_assign}")
+        chores_to_assign.sort(key=lambda c: c.ordinal)
+        logger.info("New assignments required on %s for %s", date, chores_to_assign)
         if len(chores_to_assign) == 0:
             return
 
@@ -427,86 +647,209 @@ class Manager:
                 existing_assignments = [existing_row[c] for c in chores_on_date]
             existing_assignments = [a for a in existing_assignments if a is not None]
             unchanged_assignments = [a for a in existing_assignments if a.chore != c]
+            busy_people = [a.person for a in unchanged_assignments] + [
+                a.trainee for a in unchanged_assignments if a.trainee is not None
+            ]
 
-            choices = self.all_independently_valid_assignments(date, c)
-            valid_rows = []
-            for choice in choices:
-                try:
-                    new_row = row.Row(unchanged_assignments + [choice])
-                except Exception:
-                    pass
-                else:
-                    valid_rows.append(new_row)
-
-            if len(valid_rows) == 0:
-                logger.info(f"No valid combination of assignments found for {date}")
+            choices = self.valid_choices(date, c, busy_people)
+            if len(choices) == 0:
+                logger.info("No valid combination of assignments found for %s", date)
                 if len(existing_assignments) > 0:
-                    logger.info(f"Re-evaluating all chores due on {date}")
+                    logger.info("Re-evaluating all chores due on %s", date)
+                    profiling.count("backtracks")
+                    # The sessions trainees had on the dropped row are taken
+                    # back off, as they were when the row was added.
+                    for a in existing_assignments:
+                        if a.trainee is not None:
+                            self._reduce_experience(a.trainee, a.chore)
+
                     del self.rota[date]
                     self.assign_chores_on(date)
                     return
                 else:
                     raise NoValidAssignments(date)
 
-            weights = [self.row_weight(r) for r in valid_rows]
+            # A trainee does not change the weight, so each person is scored
+            # once as a bare slot and only the winning choice is made into an
+            # Assignment.
+            people = list(dict.fromkeys(p for p, _ in choices))
+            candidates = [unchanged_assignments + [scoring.Slot(c, p)] for p in people]
+            with profiling.phase("row_weight"):
+                previous_rows = self.recent_rows(date)
+                if self.configuration.vectorised_scoring:
+                    from rotafy.api import vectorised
+
+                    weights = vectorised.row_weights(
+                        previous_rows, candidates, len(self.configuration.chores)
+                    )
+                else:
+                    weights = [
+                        self.assignments_weight(previous_rows, candidate)
+                        for candidate in candidates
+                    ]
+            weights_by_person = dict(zip(people, weights))
             max_weight = max(weights)
-            index_with_max = [i for i, w in enumerate(weights) if w == max_weight]
-            best_rows = [valid_rows[i] for i in index_with_max]
-            best_row = random.choice(best_rows)
+            best_choices = [
+                (p, t) for p, t in choices if weights_by_person[p] == max_weight
+            ]
+            best_person, best_trainee = self.random.choice(best_choices)
+            best_choice = assignment.Assignment(date, c, best_person, best_trainee)
 
-            for a in best_row.assignments:
-                if a.trainee is not None:
-                    a.trainee.add_to_experience(c)
+            if best_choice.trainee is not None:
+                self._add_to_experience(best_choice.trainee, c)
 
-            self.rota.add_row(best_row)
+            profiling.count("row_validations")
+            self.rota.add_row(row.Row(unchanged_assignments + [best_choice]))
 
+    @_locked
+    @profiling.timed("fill")
     def fill(self) -> None:
         today = datetime.date.today()
-        all_lookahead_days = [
-            today + datetime.timedelta(days=days_to_add)
-            for days_to_add in range(self.configuration.lookahead_days + 1)
-        ]
-        for r in self.rota.rows_after(today, True):
-            if r.date not in all_lookahead_days:
-                all_lookahead_days.append(row.date)
+        last_lookahead_day = today + datetime.timedelta(
+            days=self.configuration.lookahead_days
+        )
+        chores_on_dates = set()
+        for c in self.configuration.chores:
+            profiling.count("rrule_queries")
+            chores_on_dates.update(c.occurrences(today, last_lookahead_day))
+
+        for r in self.rota.rows_after(last_lookahead_day):
+            if len(self.chores_on(r.date)) > 0:
+                chores_on_dates.add(r.date)
+
+        chores_on_dates = sorted(chores_on_dates)
+        logger.info("Attempting to fill assignments for %s", chores_on_dates)
+
+        # A seeded fill starts one generator from the seed and draws every tie
+        # break from it, so the same history always gives the same rota and a
+        # date that is re-evaluated after backtracking gets fresh draws.
+        if self.seed is not None:
+            self.random = random.Random(self.seed)
 
-        chores_on_dates = [
-            date for date in all_lookahead_days if len(self.chores_on(date)) > 0
-        ]
-        logger.info(f"Attempting to fill assignments for {chores_on_dates}")
-        chores_on_dates.sort()
         for date in chores_on_dates:
             self.assign_chores_on(date)
 
-        self.rota.save()
+        self._save()
 
+    @_locked
+    @profiling.timed("compact")
+    def compact(self) -> int:
+        before = datetime.date.today() - datetime.timedelta(
+            days=self.configuration.retention_days
+        )
+        # Fairness looks back over the most recent rows, so they are never
+        # archived however old they are.
+        return self.rota.compact(before, scoring.MAX_LOOK_BACK)
+
+    @_locked
+    @profiling.timed("import_records")
+    def import_records(self, file_path: str) -> int:
+        imported = records.merge_records(
+            self.rota,
+            records.read_records(file_path),
+            self.configuration.chores,
+            self.configuration.people,
+        )
+        self._save()
+        return imported
+
+    def export_records(
+        self,
+        file_path: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> int:
+        return records.write_records(self.rota.iter_assignments(start, end), file_path)
+
+    @_locked
+    @profiling.timed("notify")
     def notify(self) -> None:
         today = datetime.date.today()
+        notice = {
+            c.name: datetime.timedelta(days=c.notify)
+            for c in self.configuration.chores
+            if c.notify != False
+        }
+        if len(notice) == 0:
+            return
 
-        for c in self.configuration.chores:
-            if c.notify == False:
-                continue
-
-            notification_cut_off = today + datetime.timedelta(days=c.notify)
-            for r in self.rota.rows_prior(notification_cut_off, True):
-                a = r[c]
-                if a is not None and a.notification_sent == False:
-                    self.notifier.message_from_assignment(a)
-                    try:
-                        retry_call(
-                            _notifier_send,
-                            fargs=[self.notifier],
-                            exceptions=ApiException,
-                            tries=3,
-                            delay=5,
-                            backoff=5,
-                        )
-                    except Exception as e:
-                        raise e
-                    else:
-                        a.mark_notified()
-                        self.rota.save()
+        # Only unsent assignments up to the furthest cut-off are looked at, then
+        # each is checked against its own chore's cut-off. They are sent in the
+        # order they are due to be sent by.
+        due = [
+            a
+            for a in self.rota.unsent_assignments(today, today + max(notice.values()))
+            if a.chore.name in notice and a.date - notice[a.chore.name] <= today
+        ]
+        due.sort(key=lambda a: a.date - notice[a.chore.name])
+        if len(due) == 0:
+            return
 
+        messages = {}
+        for a in due:
+            key = outbox.assignment_key(a)
+            messages[key] = self.notifier.message_from_assignment(a)
+
+        profiling.count("notifications", len(self.notifier.queue))
+        self.notifier.queue = []
+        if self.dry_run:
+            logger.info(
+                "Dry run, not sending %s messages", sum(map(len, messages.values()))
+            )
+            return
 
-def _notifier_send(notifier: notifier.Notifier) -> None:
-    notifier.send()
+        # The outbox is saved before sending and after the transport answers,
+        # and assignments are only marked once all of their messages are sent.
+        self.outbox.load()
+        self.outbox.sync(messages)
+        unsent = self.outbox.unsent()
+        self.outbox.start_sending(unsent)
+        self.outbox.save()
+
+        # Messages that fail stay in the Notifier's queue, so each retry only
+        # resends those.
+        self.notifier.queue = [e.message for e in unsent]
+        statuses = {}
+        try:
+            retry_call(
+                _notifier_send,
+                fargs=[self.notifier, self.outbox, statuses],
+                exceptions=(ApiException, notifier.APIStatusNotSuccessful),
+                tries=NOTIFY_TRIES,
+                delay=NOTIFY_DELAY,
+                backoff=NOTIFY_BACKOFF,
+            )
+        finally:
+            self.notifier.queue = []
+            self.outbox.reconcile(statuses)
+            self.outbox.save()
+            self._mark_notified(due, messages)
+
+    def _mark_notified(
+        self,
+        assignments: Iterable[assignment.Assignment],
+        messages: dict[str, list[transport.Message]],
+    ) -> None:
+        marked = 0
+        for a in assignments:
+            # Assignments with nobody to message have nothing to deliver.
+            key = outbox.assignment_key(a)
+            if len(messages[key]) == 0 or self.outbox.delivered(key):
+                a.mark_notified()
+                marked += 1
+
+        if marked > 0:
+            self._save()
+
+
+def _notifier_send(
+    message_notifier: notifier.Notifier,
+    message_outbox: outbox.Outbox,
+    statuses: dict[str, str],
+) -> None:
+    message_outbox.attempted(m.message_id for m in message_notifier.queue)
+    try:
+        statuses.update(message_notifier.send())
+    except notifier.APIStatusNotSuccessful as e:
+        statuses.update(e.statuses)
+        raise
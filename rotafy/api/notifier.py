@@ -1,17 +1,22 @@
-import clicksend_client
 import logging
 import datetime
 import jinja2
-import ast
+import functools
 from rotafy.config import person
 from rotafy.rota import assignment, printable
+from rotafy.api import outbox, transport
 
 
 logger = logging.getLogger(__name__)
 
+_jinja_env = jinja2.Environment(loader=jinja2.BaseLoader())
+
 
 class APIStatusNotSuccessful(Exception):
-    def __init__(self, status_message: str) -> None:
+    def __init__(
+        self, status_message: str, statuses: dict[str, str] | None = None
+    ) -> None:
+        self.statuses = statuses or {}
         super().__init__(
             f"API returned status message '{status_message}'. See https://developers.clicksend.com/docs/#status-codes for more information."
         )
@@ -19,36 +24,29 @@ class APIStatusNotSuccessful(Exception):
 
 class Notifier:
     def __init__(
-        self, clicksend_username: str, clicksend_api_key: str, message_template: str
+        self, message_transport: transport.Transport, message_template: str
     ) -> None:
-        clicksend_config = clicksend_client.Configuration()
-        clicksend_config.username = clicksend_username
-        clicksend_config.password = clicksend_api_key
-        configured_client = clicksend_client.ApiClient(clicksend_config)
-        self.clicksend_api = clicksend_client.SMSApi(configured_client)
-
-        jinja_env = jinja2.Environment(loader=jinja2.BaseLoader())
-        self.template = jinja_env.from_string(message_template)
+        self.transport = message_transport
+        self.template = compile_template(message_template)
+        self._formatted_dates = {}
 
         self.queue = []
 
     def format_upcoming_date(self, date: datetime.date) -> str:
-        date_ordinal = printable.ordinal(date.day)
+        # Most messages in a run share a handful of dates, so each is formatted
+        # once per day the Notifier is used.
+        key = (datetime.date.today(), date)
+        if key not in self._formatted_dates:
+            self._formatted_dates[key] = _format_upcoming_date(date, key[0])
 
-        today = datetime.date.today()
-        days_to_date = (date - today).days
-        if days_to_date < 7:
-            day_of_week = date.strftime("%A")
-            return f"{day_of_week} ({date_ordinal})"
-
-        return printable.human_readable_date(date, True, False)
+        return self._formatted_dates[key]
 
     def add_to_queue(
         self, recipient: person.Person, assignment_to_notify: assignment.Assignment
-    ) -> None:
+    ) -> transport.Message | None:
         if assignment_to_notify.date < datetime.date.today():
             logger.error(f"Cannot notify for an assignment in the past.")
-            return
+            return None
 
         assignment_str = str(assignment_to_notify)
         assignment_msg = assignment_str.replace(recipient.name, "you")
@@ -60,38 +58,55 @@ class Notifier:
             assignment=assignment_msg,
         )
 
-        logger.info(f"Adding message '{message}' to {recipient.telephone} to queue")
-        sms = clicksend_client.SmsMessage(
-            source="Rotafy", body=message, to=recipient.telephone
+        logger.info("Adding message '%s' to %s to queue", message, recipient.telephone)
+        sms = transport.Message(
+            recipient.telephone,
+            message,
+            message_id=outbox.message_id(assignment_to_notify, recipient),
         )
         self.queue.append(sms)
+        return sms
 
     def message_from_assignment(
         self, assignment_to_notify: assignment.Assignment
-    ) -> None:
-        self.add_to_queue(assignment_to_notify.person, assignment_to_notify)
+    ) -> list[transport.Message]:
+        recipients = [assignment_to_notify.person]
         if assignment_to_notify.trainee is not None:
-            self.add_to_queue(assignment_to_notify.trainee, assignment_to_notify)
+            recipients.append(assignment_to_notify.trainee)
+
+        messages = [self.add_to_queue(r, assignment_to_notify) for r in recipients]
+        return [m for m in messages if m is not None]
 
-    def send(self) -> None:
+    def send(self) -> dict[str, str]:
+        # Returns the status of each message by id. Messages that were not
+        # successful stay in the queue.
         if len(self.queue) == 0:
-            return
-        
-        messages_to_send = clicksend_client.SmsMessageCollection(messages=self.queue)
-        try:
-            api_response = self.clicksend_api.sms_send_post(messages_to_send)
-        except Exception as e:
-            raise e
-        else:
-            logger.info(f"API Response: {api_response}")
-
-            api_response_data = ast.literal_eval(api_response)
-            statuses = [m["status"] for m in api_response_data["data"]["messages"]]
-            unsuccessful_statuses = [
-                status for status in statuses if status != "SUCCESS"
-            ]
-            if len(unsuccessful_statuses) > 0:
-                raise APIStatusNotSuccessful(unsuccessful_statuses[0])
-
-            logger.info(f"All {len(self.queue)} messages in queue sent")
-            self.queue = []
+            return {}
+
+        statuses = self.transport.send(self.queue)
+        statuses_by_id = {m.message_id: s for m, s in zip(self.queue, statuses)}
+        unsuccessful = [(m, s) for m, s in zip(self.queue, statuses) if s != "SUCCESS"]
+        self.queue = [m for m, _ in unsuccessful]
+        if len(unsuccessful) > 0:
+            raise APIStatusNotSuccessful(unsuccessful[0][1], statuses_by_id)
+
+        logger.info("All %s messages in queue sent", len(statuses))
+        return statuses_by_id
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(message_template: str) -> jinja2.Template:
+    # Templates are shared by every Notifier with the same message text, so
+    # batch runs over many rotas compile each one once.
+    return _jinja_env.from_string(message_template)
+
+
+def _format_upcoming_date(date: datetime.date, today: datetime.date) -> str:
+    date_ordinal = printable.ordinal(date.day)
+
+    days_to_date = (date - today).days
+    if days_to_date < 7:
+        day_of_week = date.strftime("%A")
+        return f"{day_of_week} ({date_ordinal})"
+
+    return printable.human_readable_date(date, True, False)
@@ -0,0 +1,160 @@
+import csv
+import datetime
+import json
+import logging
+import os
+from typing import Iterable
+from rotafy.config import chore, person
+from rotafy.api import manager
+
+
+logger = logging.getLogger(__name__)
+
+# The fields each action needs, in the order they are passed to the Manager.
+ACTIONS = {
+    "assign": ("date", "chore", "person"),
+    "train": ("date", "chore", "person"),
+    "remove": ("date", "person"),
+    "swap": ("date", "person", "other_person"),
+    "replace": ("date", "person", "other_person"),
+}
+
+
+class InvalidOperation(Exception):
+    def __init__(self, number: int, reason: str) -> None:
+        super().__init__(f"Operation {number} is invalid: {reason}.")
+
+
+class UnsupportedOperationsFile(Exception):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(
+            f"Cannot read operations from {file_path}. Must be a .csv or .json file."
+        )
+
+
+class Operation:
+    def __init__(
+        self, number: int, action: str, date: datetime.date, arguments: Iterable[str]
+    ) -> None:
+        self.number = number
+        self.action = action
+        self.date = date
+        self.arguments = tuple(arguments)
+
+    def __repr__(self) -> str:
+        init_args = (self.number, self.action, self.date, self.arguments)
+        reprs = (repr(arg) for arg in init_args)
+        return f"Operation({', '.join(reprs)})"
+
+    def validate(self, m: manager.Manager) -> None:
+        fields = ACTIONS[self.action][1:]
+        for field, value in zip(fields, self.arguments):
+            try:
+                if field == "chore":
+                    chore.find_chore(value, m.configuration.chores)
+                else:
+                    person.find_person(value, m.configuration.people)
+            except (chore.ChoreNotFound, person.PersonNotFound) as e:
+                raise InvalidOperation(self.number, str(e).rstrip("."))
+
+        # Checked against the rota as it is before any operation is applied.
+        try:
+            self._check_rota(m)
+        except (
+            manager.DateNotFound,
+            manager.PersonNotAssigned,
+            manager.ChoreNotAssigned,
+            manager.ReplacementPersonAlreadyAssigned,
+        ) as e:
+            raise InvalidOperation(self.number, str(e).rstrip("."))
+
+    def _check_rota(self, m: manager.Manager) -> None:
+        if self.action in ("assign", "train"):
+            chore_name = self.arguments[0]
+            chore_to_do = chore.find_chore(chore_name, m.configuration.chores)
+            if chore_to_do.on(self.date) == False:
+                raise InvalidOperation(
+                    self.number, f"{chore_name} is not done on {self.date}"
+                )
+
+            if self.action == "train":
+                existing_row = m.rota[self.date]
+                if existing_row is None:
+                    raise manager.DateNotFound(self.date)
+
+                if existing_row[chore_to_do] is None:
+                    raise manager.ChoreNotAssigned(self.date, chore_name)
+
+            return
+
+        for person_name in self.arguments[: 1 if self.action == "replace" else 2]:
+            if m.find_assignment(self.date, person_name) is None:
+                raise manager.PersonNotAssigned(self.date, person_name)
+
+        if self.action == "replace":
+            replacement_name = self.arguments[1]
+            if m.find_assignment(self.date, replacement_name) is not None:
+                raise manager.ReplacementPersonAlreadyAssigned(
+                    self.date, replacement_name
+                )
+
+    def apply(self, m: manager.Manager) -> None:
+        methods = {
+            "assign": m.add_person,
+            "train": m.add_trainee,
+            "remove": m.remove_person,
+            "swap": m.swap,
+            "replace": m.replace,
+        }
+        methods[self.action](self.date, *self.arguments)
+
+
+def parse_operation(number: int, raw_operation: dict) -> Operation:
+    action = str(raw_operation.get("action") or "").strip().lower()
+    if action not in ACTIONS:
+        raise InvalidOperation(
+            number,
+            f"action must be one of {', '.join(ACTIONS.keys())}, not {action!r}",
+        )
+
+    values = []
+    for field in ACTIONS[action]:
+        value = str(raw_operation.get(field) or "").strip()
+        if len(value) == 0:
+            raise InvalidOperation(number, f"{action} needs a {field}")
+
+        values.append(value)
+
+    try:
+        date = datetime.date.fromisoformat(values[0])
+    except ValueError:
+        raise InvalidOperation(number, f"{values[0]} is not a YYYY-MM-DD date")
+
+    return Operation(number, action, date, values[1:])
+
+
+def read_operations(file_path: str) -> list[Operation]:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        with open(file_path, newline="") as f:
+            raw_operations = list(csv.DictReader(f))
+    elif extension == ".json":
+        with open(file_path) as f:
+            raw_operations = json.load(f)
+    else:
+        raise UnsupportedOperationsFile(file_path)
+
+    return [parse_operation(i + 1, raw) for i, raw in enumerate(raw_operations)]
+
+
+def apply_operations(m: manager.Manager, operations: Iterable[Operation]) -> None:
+    # Every operation is checked before any are applied, then they are applied
+    # in one batch so the rota is saved once, or not at all if any fail.
+    operations = list(operations)
+    for o in operations:
+        o.validate(m)
+
+    logger.info("Applying %s operations to %s", len(operations), m.name)
+    with m.batch():
+        for o in operations:
+            o.apply(m)
@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+from typing import Iterable
+from rotafy.config import person
+from rotafy.rota import assignment, rota
+from rotafy.api import transport
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def assignment_key(a: assignment.Assignment) -> str:
+    return f"{a.date.isoformat()}/{a.chore.name}"
+
+
+def message_id(a: assignment.Assignment, recipient: person.Person) -> str:
+    return f"{assignment_key(a)}/{recipient.name}"
+
+
+class Entry:
+    def __init__(
+        self,
+        message_id: str,
+        assignment_key: str,
+        message: transport.Message,
+        status: str = PENDING,
+        attempts: int = 0,
+    ) -> None:
+        self.message_id = message_id
+        self.assignment_key = assignment_key
+        self.message = message
+        self.status = status
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        init_args = (
+            self.message_id,
+            self.assignment_key,
+            self.message,
+            self.status,
+            self.attempts,
+        )
+        reprs = (repr(arg) for arg in init_args)
+        return f"Entry({', '.join(reprs)})"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.message_id,
+            "assignment": self.assignment_key,
+            "message": self.message.to_dict(),
+            "status": self.status,
+            "attempts": self.attempts,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Entry":
+        m = d["message"]
+        return cls(
+            d["id"],
+            d["assignment"],
+            transport.Message(m["to"], m["body"], m["source"], m["id"]),
+            d["status"],
+            d["attempts"],
+        )
+
+
+class Outbox:
+    # The delivery state of every reminder due in the current notify round. It
+    # is written before anything is sent and again once the transport answers,
+    # so a round that dies part way through resumes without resending the
+    # messages that were already accepted.
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.entries = {}
+
+    def __repr__(self) -> str:
+        return f"Outbox({repr(self.file_path)})"
+
+    def load(self) -> None:
+        self.entries = {}
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path) as f:
+            for d in json.load(f):
+                e = Entry.from_dict(d)
+                self.entries[e.message_id] = e
+
+    def save(self) -> None:
+        data = json.dumps([e.to_dict() for e in self.entries.values()], indent=1)
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        rota.replace_atomically(self.file_path, lambda f: f.write(data.encode()))
+
+    def sync(self, messages: dict[str, Iterable[transport.Message]]) -> None:
+        # Keeps the entries for the given messages, by assignment key, and drops
+        # the rest, which belong to assignments that were notified, removed or
+        # given to someone else since the last round.
+        entries = {}
+        for key, key_messages in messages.items():
+            for m in key_messages:
+                existing = self.entries.get(m.message_id)
+                if existing is not None and existing.status == SENT:
+                    entries[m.message_id] = existing
+                    continue
+
+                attempts = 0
+                if existing is not None:
+                    attempts = existing.attempts
+                    if existing.status == SENDING:
+                        logger.warning(
+                            "Message %s may already have been sent, resending",
+                            m.message_id,
+                        )
+
+                entries[m.message_id] = Entry(m.message_id, key, m, PENDING, attempts)
+
+        self.entries = entries
+
+    def unsent(self) -> list[Entry]:
+        return [e for e in self.entries.values() if e.status != SENT]
+
+    def start_sending(self, entries: Iterable[Entry]) -> None:
+        for e in entries:
+            e.status = SENDING
+
+    def attempted(self, message_ids: Iterable[str]) -> None:
+        # Called for every call to the transport, so retries within a round
+        # are counted too.
+        for message_id in message_ids:
+            e = self.entries.get(message_id)
+            if e is not None:
+                e.attempts += 1
+
+    def reconcile(self, statuses: dict[str, str]) -> None:
+        # Messages the transport did not report on are treated as failed, so
+        # they are retried in the next round.
+        for e in self.entries.values():
+            if e.status != SENDING:
+                continue
+
+            status = statuses.get(e.message_id)
+            if status == "SUCCESS":
+                e.status = SENT
+            else:
+                e.status = FAILED
+                logger.info("Message %s failed with status %s", e.message_id, status)
+
+    def delivered(self, key: str) -> bool:
+        key_entries = [e for e in self.entries.values() if e.assignment_key == key]
+        return len(key_entries) > 0 and all(e.status == SENT for e in key_entries)
@@ -0,0 +1,89 @@
+import contextlib
+import contextvars
+import functools
+import json
+import time
+from collections import Counter
+from typing import Callable, Iterator
+
+
+_active_profiler = contextvars.ContextVar("rotafy_active_profiler", default=None)
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.timings = {}
+        self.calls = Counter()
+        self.counters = Counter()
+
+    def __repr__(self) -> str:
+        return f"Profiler({self.to_json()})"
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # Timings are inclusive, so a phase that runs inside another phase is
+        # counted in both.
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            self.calls[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def to_dict(self) -> dict:
+        phases = {
+            name: {"seconds": seconds, "calls": self.calls[name]}
+            for name, seconds in self.timings.items()
+        }
+        return {"phases": phases, "counters": dict(self.counters)}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Profiler]:
+    profiler = Profiler()
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
+
+
+def active() -> Profiler | None:
+    return _active_profiler.get()
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return contextlib.nullcontext()
+
+    return profiler.phase(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def timed(name: str) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler.get()
+            if profiler is None:
+                return function(*args, **kwargs)
+
+            with profiler.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
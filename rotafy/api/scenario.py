@@ -0,0 +1,125 @@
+import concurrent.futures
+import datetime
+import statistics
+from typing import Iterable
+from rotafy.api import manager
+
+
+class Scenario:
+    def __init__(
+        self,
+        toml_file_path: str,
+        seed: int | None = None,
+        rota_directory: str | None = None,
+    ) -> None:
+        self.toml_file_path = toml_file_path
+        self.seed = seed
+        self.rota_directory = rota_directory
+
+    def __repr__(self) -> str:
+        init_args = (self.toml_file_path, self.seed, self.rota_directory)
+        reprs = (repr(arg) for arg in init_args)
+        return f"Scenario({', '.join(reprs)})"
+
+
+class ScenarioResult:
+    def __init__(
+        self,
+        scenario: Scenario,
+        assignments_per_person: dict[str, int],
+        scheduled: int,
+        assigned: int,
+    ) -> None:
+        self.scenario = scenario
+        self.assignments_per_person = assignments_per_person
+        self.scheduled = scheduled
+        self.assigned = assigned
+
+    def __repr__(self) -> str:
+        return f"ScenarioResult({self.to_dict()})"
+
+    @property
+    def coverage(self) -> float:
+        if self.scheduled == 0:
+            return 1.0
+
+        return self.assigned / self.scheduled
+
+    @property
+    def fairness_spread(self) -> int:
+        counts = self.assignments_per_person.values()
+        if len(counts) == 0:
+            return 0
+
+        return max(counts) - min(counts)
+
+    @property
+    def fairness_stdev(self) -> float:
+        counts = list(self.assignments_per_person.values())
+        if len(counts) == 0:
+            return 0.0
+
+        return statistics.pstdev(counts)
+
+    def to_dict(self) -> dict:
+        return {
+            "configuration": self.scenario.toml_file_path,
+            "seed": self.scenario.seed,
+            "scheduled": self.scheduled,
+            "assigned": self.assigned,
+            "coverage": self.coverage,
+            "fairness_spread": self.fairness_spread,
+            "fairness_stdev": self.fairness_stdev,
+            "assignments_per_person": dict(self.assignments_per_person),
+        }
+
+
+def run_scenario(scenario: Scenario) -> ScenarioResult:
+    # Each scenario gets its own dry-run Manager, so people's experience and
+    # the rota are never shared between scenarios and nothing is saved.
+    m = manager.Manager(
+        scenario.toml_file_path,
+        scenario.rota_directory,
+        dry_run=True,
+        seed=scenario.seed,
+    )
+
+    today = datetime.date.today()
+    window = [
+        today + datetime.timedelta(days=days_to_add)
+        for days_to_add in range(m.configuration.lookahead_days + 1)
+    ]
+
+    scheduled = sum(len(m.chores_on(date)) for date in window)
+    assignments_per_person = {p.name: 0 for p in m.configuration.people}
+    assigned = 0
+    for r in m.rota.rows_after(today, True):
+        if r.date > window[-1]:
+            continue
+
+        for a in r.assignments:
+            assigned += 1
+            assignments_per_person[a.person.name] = (
+                assignments_per_person.get(a.person.name, 0) + 1
+            )
+
+    return ScenarioResult(scenario, assignments_per_person, scheduled, assigned)
+
+
+def run_scenarios(
+    scenarios: Iterable[Scenario], max_workers: int | None = None
+) -> list[ScenarioResult]:
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_scenario, scenarios))
+
+
+def seeded_scenarios(
+    toml_file_path: str,
+    count: int,
+    rota_directory: str | None = None,
+    first_seed: int = 0,
+) -> list[Scenario]:
+    return [
+        Scenario(toml_file_path, seed, rota_directory)
+        for seed in range(first_seed, first_seed + count)
+    ]
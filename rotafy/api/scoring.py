@@ -0,0 +1,12 @@
+from typing import NamedTuple
+from rotafy.config import chore, person
+
+
+MAX_LOOK_BACK = 10
+
+
+class Slot(NamedTuple):
+    # The parts of an assignment that scoring looks at, for candidates that are
+    # not worth building a full Assignment for.
+    chore: chore.Chore
+    person: person.Person
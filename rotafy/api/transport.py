@@ -0,0 +1,178 @@
+import abc
+import json
+import logging
+import os
+import clicksend_client
+from typing import Iterable
+from rotafy.config import config
+
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("clicksend", "file", "memory")
+
+
+class UnknownTransport(Exception):
+    def __init__(self, transport_name: str) -> None:
+        super().__init__(
+            f"Unknown transport {transport_name}. Must be one of {', '.join(TRANSPORTS)}."
+        )
+
+
+class NoTransportFile(Exception):
+    def __init__(self) -> None:
+        super().__init__("Must provide a transport_file to use the file transport.")
+
+
+class Message:
+    def __init__(
+        self,
+        to: str,
+        body: str,
+        source: str = "Rotafy",
+        message_id: str | None = None,
+    ) -> None:
+        self.to = to
+        self.body = body
+        self.source = source
+        self.message_id = message_id
+
+    def __repr__(self) -> str:
+        init_args = (self.to, self.body, self.source, self.message_id)
+        reprs = (repr(arg) for arg in init_args)
+        return f"Message({', '.join(reprs)})"
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Message)
+            and self.to == other.to
+            and self.body == other.body
+            and self.source == other.source
+            and self.message_id == other.message_id
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.message_id,
+            "to": self.to,
+            "body": self.body,
+            "source": self.source,
+        }
+
+
+class Transport(abc.ABC):
+    @abc.abstractmethod
+    def send(self, messages: Iterable[Message]) -> list[str]:
+        # Returns one status per message, in order. "SUCCESS" means sent.
+        pass
+
+
+class ClickSendTransport(Transport):
+    def __init__(self, clicksend_username: str, clicksend_api_key: str) -> None:
+        clicksend_config = clicksend_client.Configuration()
+        clicksend_config.username = clicksend_username
+        clicksend_config.password = clicksend_api_key
+        configured_client = clicksend_client.ApiClient(clicksend_config)
+        self.clicksend_api = clicksend_client.SMSApi(configured_client)
+
+    def __repr__(self) -> str:
+        return "ClickSendTransport()"
+
+    def send(self, messages: Iterable[Message]) -> list[str]:
+        messages = list(messages)
+        sms_messages = [
+            clicksend_client.SmsMessage(
+                source=m.source, body=m.body, to=m.to, custom_string=m.message_id
+            )
+            for m in messages
+        ]
+        messages_to_send = clicksend_client.SmsMessageCollection(messages=sms_messages)
+        # The raw response is decoded as JSON rather than having the client
+        # turn it into a string first.
+        api_response = self.clicksend_api.sms_send_post(
+            messages_to_send, _preload_content=False
+        )
+        api_response_data = json.loads(api_response.data)
+        logger.info(
+            "API Response: %s, %s",
+            api_response_data.get("response_code"),
+            api_response_data.get("response_msg"),
+        )
+
+        return response_statuses(messages, api_response_data["data"]["messages"])
+
+
+def response_statuses(
+    messages: Iterable[Message], response_messages: Iterable[dict]
+) -> list[str]:
+    # ClickSend echoes each message's custom_string, which is its id, so
+    # statuses are matched by id. Messages without an id are matched by
+    # position, and any the response leaves out are reported as MISSING.
+    response_messages = list(response_messages)
+    statuses_by_id = {
+        m.get("custom_string"): m.get("status", "MISSING") for m in response_messages
+    }
+
+    statuses = []
+    for i, m in enumerate(messages):
+        if m.message_id is not None:
+            statuses.append(statuses_by_id.get(m.message_id, "MISSING"))
+        elif i < len(response_messages):
+            statuses.append(response_messages[i].get("status", "MISSING"))
+        else:
+            statuses.append("MISSING")
+
+    return statuses
+
+
+class FileTransport(Transport):
+    # Appends each message to a JSON Lines file instead of sending it, as a
+    # local stand-in for the SMS gateway.
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+    def __repr__(self) -> str:
+        return f"FileTransport({repr(self.file_path)})"
+
+    def send(self, messages: Iterable[Message]) -> list[str]:
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(directory, exist_ok=True)
+
+        statuses = []
+        with open(self.file_path, "a") as f:
+            for m in messages:
+                f.write(json.dumps(m.to_dict()) + "\n")
+                statuses.append("SUCCESS")
+
+        logger.info("Wrote %s messages to %s", len(statuses), self.file_path)
+        return statuses
+
+
+class MemoryTransport(Transport):
+    def __init__(self) -> None:
+        self.sent = []
+
+    def __repr__(self) -> str:
+        return "MemoryTransport()"
+
+    def send(self, messages: Iterable[Message]) -> list[str]:
+        messages = list(messages)
+        self.sent.extend(messages)
+        return ["SUCCESS"] * len(messages)
+
+
+def from_config(configuration: config.Config) -> Transport:
+    transport_name = configuration.transport.lower()
+    if transport_name == "clicksend":
+        return ClickSendTransport(
+            configuration.clicksend_username, configuration.clicksend_api_key
+        )
+    elif transport_name == "file":
+        if configuration.transport_file is None:
+            raise NoTransportFile
+
+        return FileTransport(configuration.transport_file)
+    elif transport_name == "memory":
+        return MemoryTransport()
+
+    raise UnknownTransport(configuration.transport)
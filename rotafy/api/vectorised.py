@@ -0,0 +1,92 @@
+import numpy
+from typing import Iterable
+from rotafy.config import chore, person
+from rotafy.rota import assignment, row
+from rotafy.api import scoring
+
+
+class HistoryMatrix:
+    def __init__(
+        self,
+        previous_rows: Iterable[row.Row],
+        people: Iterable[person.Person],
+        chores: Iterable[chore.Chore],
+    ) -> None:
+        # previous_rows are ordered from the most recent row backwards.
+        previous_rows = list(previous_rows)[: scoring.MAX_LOOK_BACK]
+
+        self.people = {}
+        self.chores = {}
+        for p in people:
+            self.people.setdefault(p, len(self.people))
+
+        for c in chores:
+            self.chores.setdefault(c, len(self.chores))
+
+        for r in previous_rows:
+            for a in r.assignments:
+                self.people.setdefault(a.person, len(self.people))
+                self.chores.setdefault(a.chore, len(self.chores))
+
+        # assigned[p, c, k] is True if person p did chore c in the kth most
+        # recent row.
+        shape = (len(self.people), len(self.chores), len(previous_rows))
+        self.assigned = numpy.zeros(shape, dtype=bool)
+        for k, r in enumerate(previous_rows):
+            for a in r.assignments:
+                self.assigned[self.people[a.person], self.chores[a.chore], k] = True
+
+        self.penalties = self._penalties()
+
+    def _penalties(self) -> numpy.ndarray:
+        # Mirrors Manager.row_weight: n only counts rows where the chore was
+        # done, doing the same chore costs 1 / 2^n and doing any other chore
+        # on that row costs 1 / 2^(n + 1).
+        chore_done = self.assigned.any(axis=0)
+        n = numpy.cumsum(chore_done, axis=1)
+        same_chore = numpy.where(self.assigned, 0.5**n, 0.0).sum(axis=2)
+
+        assigned_any = self.assigned.any(axis=1)
+        other_chore = (
+            assigned_any[:, numpy.newaxis, :]
+            & ~self.assigned
+            & chore_done[numpy.newaxis, :, :]
+        )
+        other_chore = numpy.where(other_chore, 0.5 ** (n + 1), 0.0).sum(axis=2)
+
+        return same_chore + other_chore
+
+
+def row_weights(
+    previous_rows: Iterable[row.Row],
+    candidates: Iterable[Iterable[assignment.Assignment]],
+    num_chores: int,
+) -> list[float]:
+    # Each candidate is the list of assignments that would make up a row. All
+    # candidates must be on the same date, as previous_rows are the rows prior
+    # to that date ordered from the most recent backwards.
+    candidates = [list(candidate) for candidate in candidates]
+    if len(candidates) == 0:
+        return []
+
+    candidate_people = [a.person for candidate in candidates for a in candidate]
+    candidate_chores = [a.chore for candidate in candidates for a in candidate]
+    history = HistoryMatrix(previous_rows, candidate_people, candidate_chores)
+
+    row_indices = numpy.array(
+        [i for i, candidate in enumerate(candidates) for _ in candidate], dtype=int
+    )
+    people_indices = numpy.array(
+        [history.people[p] for p in candidate_people], dtype=int
+    )
+    chore_indices = numpy.array(
+        [history.chores[c] for c in candidate_chores], dtype=int
+    )
+
+    penalties = numpy.bincount(
+        row_indices,
+        weights=history.penalties[people_indices, chore_indices],
+        minlength=len(candidates),
+    )
+    weights = num_chores - penalties
+    return weights.tolist()
@@ -1,6 +1,9 @@
 import click
+import datetime
 import logging
-from rotafy.api import manager
+from rotafy.api import manager, operations, profiling
+from rotafy.config import config
+from rotafy.rota import printable, rendering
 
 
 @click.group()
@@ -12,8 +15,32 @@ from rotafy.api import manager
 @click.option(
     "--verbose", "-v", is_flag=True, default=False, help="Print verbose log messages."
 )
+@click.option(
+    "--rota-directory",
+    type=click.Path(file_okay=False, dir_okay=True, writable=True),
+    default=None,
+    help="Directory where the rota is stored.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Print timings and counters for the run to stderr as JSON.",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Plan changes to the rota without saving them.",
+)
+@click.option(
+    "--seed",
+    type=click.INT,
+    default=None,
+    help="Seed used to break ties, so the same rota is always planned.",
+)
 @click.pass_context
-def cli(ctx, configuration_file, verbose):
+def cli(ctx, configuration_file, verbose, rota_directory, profile, dry_run, seed):
     log_format = "%(levelname)s @ %(asctime)s - %(message)s"
     log_level = logging.ERROR
     if verbose:
@@ -21,7 +48,11 @@ def cli(ctx, configuration_file, verbose):
 
     logging.basicConfig(format=log_format, level=log_level)
 
-    ctx.obj = manager.Manager(configuration_file)
+    if profile:
+        profiler = ctx.with_resource(profiling.profile())
+        ctx.call_on_close(lambda: click.echo(profiler.to_json(), err=True))
+
+    ctx.obj = manager.Manager(configuration_file, rota_directory, dry_run, seed)
 
 
 @cli.command("print", help="Print the upcoming rota to the screen.")
@@ -30,6 +61,12 @@ def print_to_screen(m):
     m.print()
 
 
+@cli.command(help="Print the changes a dry run would make to the rota.")
+@click.pass_obj
+def plan(m):
+    m.print_plan()
+
+
 @cli.command(help="Output the upcoming rota to a PDF file.")
 @click.argument("filename", type=click.Path(exists=False), required=True)
 @click.pass_obj
@@ -37,6 +74,42 @@ def to_pdf(m, filename):
     m.to_pdf(filename)
 
 
+@cli.command(
+    help="Output the upcoming rota, and the stored rotas of any other configuration "
+    "files, to one PDF each in a directory."
+)
+@click.argument(
+    "output_directory",
+    type=click.Path(file_okay=False, dir_okay=True, writable=True),
+    required=True,
+)
+@click.argument(
+    "other_configuration_files",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+    nargs=-1,
+)
+@click.pass_obj
+def to_pdfs(m, output_directory, other_configuration_files):
+    rotas = [m.rota]
+    for configuration_file in other_configuration_files:
+        other = config.Config(configuration_file)
+        rotas.append(printable.PrintableRota(other.name, other.rota_directory))
+
+    rendering.render_rotas(rotas, output_directory)
+
+
+@cli.command(help="Output the upcoming rota to one PDF per month in a directory.")
+@click.argument(
+    "output_directory",
+    type=click.Path(file_okay=False, dir_okay=True, writable=True),
+    required=True,
+)
+@click.pass_obj
+def to_pdf_months(m, output_directory):
+    today = datetime.date.today()
+    rendering.render_months(m.rota, output_directory, today, m.rota.latest_date)
+
+
 @cli.command(help="Send notifications to individuals with upcoming chores.")
 @click.pass_obj
 def notify(m):
@@ -82,6 +155,53 @@ def replace(m, date, person, replacement):
     m.replace(date.date(), person, replacement)
 
 
+@cli.command(
+    "apply",
+    help="Apply the operations in a CSV or JSON file to the rota, saving once.",
+)
+@click.argument(
+    "filename",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+    required=True,
+)
+@click.pass_obj
+def apply_operations(m, filename):
+    operations.apply_operations(m, operations.read_operations(filename))
+
+
+@cli.command(help="Archive rows older than the configured retention period.")
+@click.pass_obj
+def compact(m):
+    archived = m.compact()
+    click.echo(f"Archived {archived} rows.")
+
+
+@cli.command(
+    "import", help="Import assignments from a CSV or JSON Lines file, saving once."
+)
+@click.argument(
+    "filename",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
+    required=True,
+)
+@click.pass_obj
+def import_records(m, filename):
+    imported = m.import_records(filename)
+    click.echo(f"Imported {imported} rows.")
+
+
+@cli.command("export", help="Export assignments to a CSV or JSON Lines file.")
+@click.argument("filename", type=click.Path(exists=False), required=True)
+@click.option("--start", type=click.DateTime(), default=None, help="First date.")
+@click.option("--end", type=click.DateTime(), default=None, help="Last date.")
+@click.pass_obj
+def export_records(m, filename, start, end):
+    start = None if start is None else start.date()
+    end = None if end is None else end.date()
+    exported = m.export_records(filename, start, end)
+    click.echo(f"Exported {exported} assignments.")
+
+
 @cli.command("path", help="Print the path where the rota is stored.")
 @click.pass_obj
 def print_rota_path(m):
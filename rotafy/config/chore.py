@@ -1,7 +1,9 @@
 from recurrent.event_parser import RecurringEvent
+import bisect
 import datetime
+import functools
 from dateutil import rrule
-from typing import Iterable
+from typing import Iterable, Iterator
 
 
 class NoChoreName(Exception):
@@ -16,6 +18,17 @@ class ChoreNotFound(Exception):
         )
 
 
+class InvalidAnchor(Exception):
+    def __init__(self, anchor) -> None:
+        super().__init__(
+            f"Recurrence anchor {anchor!r} must be a date or a YYYY-MM-DD string."
+        )
+
+
+# Calendar years of expanded rule dates kept across all chores.
+OCCURRENCE_CACHE_SIZE = 1024
+
+
 class Chore:
     def __init__(
         self,
@@ -26,16 +39,30 @@ class Chore:
         num_training_sessions: int,
         num_shadowing_sessions: int,
         exceptions: Iterable[datetime.date] = [],
+        anchor: datetime.date | str | None = None,
     ) -> None:
         self.name = name
         self.ordinal = ordinal
         self._raw_recurrence = recurrence
-        self.recurring_rule = generate_rrule(recurrence)
+        self.anchor = _to_date(anchor)
+        self._anchor_date = self.anchor
+        if self._anchor_date is None:
+            self._anchor_date = datetime.date.today()
+
+        self.recurring_rule = generate_rrule(recurrence, self._anchor_date)
         self.notify = notify
         self.num_training_sessions = num_training_sessions
         self.num_shadowing_sessions = num_shadowing_sessions
         self.exceptions = exceptions
 
+    def __setstate__(self, state: dict) -> None:
+        # Chores pickled before anchors existed were anchored to the day they
+        # were created, which is the start of their rule.
+        self.__dict__.update(state)
+        if "anchor" not in state:
+            self.anchor = None
+            self._anchor_date = _rule_start(self.recurring_rule).date()
+
     def __repr__(self) -> str:
         init_args = (
             self.name,
@@ -45,6 +72,7 @@ class Chore:
             self.num_training_sessions,
             self.num_shadowing_sessions,
             self.exceptions,
+            self.anchor,
         )
         reprs = (repr(arg) for arg in init_args)
         s = f"Chore({', '.join(reprs)})"
@@ -59,22 +87,62 @@ class Chore:
     def __hash__(self) -> int:
         return hash(self.name)
 
+    def _rule_dates(self, year: int) -> tuple[datetime.date, ...] | None:
+        # None means the rule has no dates in or after the year.
+        return _dates_in_year(self._raw_recurrence.lower(), self._anchor_date, year)
+
+    def _in_rule(self, date: datetime.date) -> bool:
+        dates = self._rule_dates(date.year)
+        if dates is None:
+            return False
+
+        i = bisect.bisect_left(dates, date)
+        return i < len(dates) and dates[i] == date
+
+    def _iter_rule_dates(self, start_date: datetime.date) -> Iterator[datetime.date]:
+        year = start_date.year
+        while True:
+            dates = self._rule_dates(year)
+            if dates is None:
+                return
+
+            yield from dates[bisect.bisect_left(dates, start_date) :]
+            year += 1
+
     def on(self, date: datetime.date) -> bool:
-        timestamp = datetime.datetime.combine(date, datetime.time.min)
-        rrule_date = self.recurring_rule.after(timestamp, inc=True).date()
-        in_rrule = rrule_date == date
+        in_rrule = self._in_rule(date)
         if date in self.exceptions:
             return not (in_rrule)
 
         return in_rrule
 
-    def next(self, start_date: datetime.date) -> datetime.date:
-        timestamp = datetime.datetime.combine(start_date, datetime.time.min)
-        next_date = self.recurring_rule.after(timestamp)
-        while next_date.date() in self.exceptions:
-            next_date = self.recurring_rule.after(next_date)
+    def next(self, start_date: datetime.date) -> datetime.date | None:
+        # Searches on through later years, so None only when the rule has no
+        # dates left after start_date.
+        after_start = start_date + datetime.timedelta(days=1)
+        for next_date in self._iter_rule_dates(after_start):
+            if next_date not in self.exceptions:
+                return next_date
+
+        return None
+
+    def occurrences(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> list[datetime.date]:
+        # Every date between start_date and end_date inclusive that the chore
+        # is on.
+        found = set()
+        for d in self._iter_rule_dates(start_date):
+            if d > end_date:
+                break
+
+            found.add(d)
 
-        return next_date.date()
+        for d in set(self.exceptions):
+            if start_date <= d <= end_date:
+                found ^= {d}
+
+        return sorted(found)
 
     @property
     def name(self) -> str:
@@ -88,20 +156,79 @@ class Chore:
         self._name = value.strip()
 
 
-def generate_rrule(recurrence: str) -> rrule.rrule:
-    start_of_today = datetime.datetime.combine(datetime.date.today(), datetime.time.min)
-    recurring_event = RecurringEvent(now_date=start_of_today)
-    recurring_event_rrule = recurring_event.parse(recurrence.lower())
+def generate_rrule(
+    recurrence: str, anchor: datetime.date | None = None
+) -> rrule.rrule | rrule.rruleset:
+    # Rules start on the anchor date, or today without one. Anchored rules are
+    # the same whichever day they are generated on, so "every other week" keeps
+    # its phase and the compiled rule is shared between chores.
+    if anchor is None:
+        anchor = datetime.date.today()
+
+    return _compile_rrule(recurrence.lower(), anchor)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_rrule(
+    recurrence: str, anchor: datetime.date
+) -> rrule.rrule | rrule.rruleset:
+    start_of_anchor = datetime.datetime.combine(anchor, datetime.time.min)
+    recurring_event = RecurringEvent(now_date=start_of_anchor)
+    recurring_event_rrule = recurring_event.parse(recurrence)
     rule = rrule.rrulestr(recurring_event_rrule)
     if isinstance(rule, rrule.rrule):
-        rule = rule.replace(dtstart=start_of_today)
+        rule = rule.replace(dtstart=start_of_anchor)
 
     if isinstance(rule, rrule.rruleset):
-        rule._rrule = [r.replace(dtstart=start_of_today) for r in rule._rrule]
+        rule._rrule = [r.replace(dtstart=start_of_anchor) for r in rule._rrule]
 
     return rule
 
 
+@functools.lru_cache(maxsize=OCCURRENCE_CACHE_SIZE)
+def _dates_in_year(
+    recurrence: str, anchor: datetime.date, year: int
+) -> tuple[datetime.date, ...] | None:
+    # The recurrence rule is expanded a calendar year at a time and shared by
+    # every chore with the same recurrence and anchor.
+    rule = _compile_rrule(recurrence, anchor)
+    start_of_year = datetime.datetime(year, 1, 1)
+    start_of_next_year = datetime.datetime(year + 1, 1, 1)
+    dates = tuple(
+        d.date()
+        for d in rule.between(start_of_year, start_of_next_year, inc=True)
+        if d < start_of_next_year
+    )
+    if len(dates) == 0 and rule.after(start_of_year) is None:
+        return None
+
+    return dates
+
+
+def _to_date(anchor: datetime.date | str | None) -> datetime.date | None:
+    if anchor is None:
+        return None
+
+    if isinstance(anchor, datetime.datetime):
+        return anchor.date()
+
+    if isinstance(anchor, datetime.date):
+        return anchor
+
+    try:
+        return datetime.date.fromisoformat(anchor.strip())
+    except (AttributeError, ValueError):
+        raise InvalidAnchor(anchor)
+
+
+def _rule_start(rule: rrule.rrule | rrule.rruleset) -> datetime.datetime:
+    rules = rule._rrule if isinstance(rule, rrule.rruleset) else [rule]
+    if len(rules) == 0:
+        return datetime.datetime.combine(datetime.date.today(), datetime.time.min)
+
+    return rules[0]._dtstart
+
+
 def find_chore(chore_name: str, chores: Iterable[Chore]) -> Chore:
     for chore in chores:
         if chore.name == chore_name:
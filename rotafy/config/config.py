@@ -12,6 +12,20 @@ class Config:
         self.name = self.raw["name"]
 
         self.lookahead_days = self.raw.get("lookahead_days", 14)
+        self.retention_days = self.raw.get("retention_days", 365)
+        self.seed = self.raw.get("seed", None)
+        self.vectorised_scoring = self.raw.get("vectorised_scoring", False)
+
+        if "ROTAFY_ROTA_DIRECTORY" in os.environ:
+            # Relative directories from the environment are relative to the
+            # working directory, like those passed on the command line.
+            self.rota_directory = os.path.abspath(
+                os.path.expanduser(os.environ.get("ROTAFY_ROTA_DIRECTORY"))
+            )
+        else:
+            self.rota_directory = self._relative_to_file(
+                self.raw.get("rota_directory", None)
+            )
 
         if "CLICKSEND_USERNAME" in os.environ:
             self.clicksend_username = os.environ.get("CLICKSEND_USERNAME", "")
@@ -23,6 +37,15 @@ class Config:
         else:
             self.clicksend_api_key = self.raw.get("clicksend_api_key", "")
         
+        self.transport = self.raw.get("transport", "clicksend")
+        self.transport_file = self.raw.get("transport_file", None)
+        if self.transport_file is not None:
+            # Relative files are relative to the configuration file.
+            self.transport_file = os.path.join(
+                os.path.dirname(os.path.abspath(self.path)),
+                os.path.expanduser(self.transport_file),
+            )
+
         self.message_template = self.raw.get(
             "message",
             "Hi {{recipient}}! On {{date}}, {{chore}} is due to be handled by "
@@ -49,6 +72,7 @@ class Config:
                     self.raw.get("default_number_of_shadowing_sessions", 1),
                 ),
                 raw_chore.get("exceptions", []),
+                raw_chore.get("anchor", self.raw.get("recurrence_anchor", None)),
             )
             self.chores.add(this_chore)
 
@@ -88,6 +112,15 @@ class Config:
     def __eq__(self, other) -> bool:
         return other and self.name == other.name
 
+    def _relative_to_file(self, path: str | None) -> str | None:
+        # Relative paths in the configuration file are relative to the file.
+        if path is None:
+            return None
+
+        return os.path.join(
+            os.path.dirname(os.path.abspath(self.path)), os.path.expanduser(path)
+        )
+
     def _get_chores_from_names(self, names: Iterable[str]) -> Iterable[chore.Chore]:
         if len(names) == 1:
             singleton_name = names[0].lower()
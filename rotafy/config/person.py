@@ -59,14 +59,14 @@ class Person:
     def is_learning(self, chore: chore.Chore) -> bool:
         return chore in self.experience.keys()
 
-    def add_to_experience(self, chore: chore.Chore) -> None:
+    def add_to_experience(self, chore: chore.Chore, sessions: int = 1) -> None:
         if chore in self.skills:
             return
 
         if chore in self.experience.keys():
-            self.experience[chore] += 1
+            self.experience[chore] += sessions
         else:
-            self.experience[chore] = 1
+            self.experience[chore] = sessions
 
         qualification_threshold = (
             chore.num_training_sessions + chore.num_shadowing_sessions
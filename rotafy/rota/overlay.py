@@ -0,0 +1,101 @@
+import contextlib
+import copy
+import datetime
+import logging
+import os
+from typing import Iterable, Iterator
+from rotafy.rota import printable, rota, row
+
+
+logger = logging.getLogger(__name__)
+
+
+class OverlayRota(printable.PrintableRota):
+    def __init__(self, base: rota.Rota) -> None:
+        self.base = base
+        super().__init__(base.name, os.path.dirname(base.file_path))
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        yield
+
+    def is_stale(self) -> bool:
+        return False
+
+    def load(self) -> None:
+        # Rows are shared with the base rota until the overlay hands them out
+        # for mutation.
+        self.archived_training = self.base.archived_training
+        self.archived_until = self.base.archived_until
+        self.training = copy.deepcopy(self.base.training)
+        self._rows = list(self.base.rows)
+        self.sort()
+        self._shared = set(id(r) for r in self.base.rows)
+
+    def save(self) -> None:
+        logger.info("Dry run, not saving %s", self.file_path)
+
+    def compact(self, before: datetime.date, keep: int = 0) -> int:
+        logger.info("Dry run, not compacting %s", self.file_path)
+        return 0
+
+    def _copy_on_write(self, shared_row: row.Row) -> row.Row:
+        if id(shared_row) not in self._shared:
+            return shared_row
+
+        copied_row = row.Row([copy.copy(a) for a in shared_row.assignments])
+        self.rows[self._position(shared_row.date)] = copied_row
+        self._by_date[shared_row.date] = copied_row
+        return copied_row
+
+    def __getitem__(self, date: datetime.date) -> row.Row | None:
+        found_row = super().__getitem__(date)
+        if found_row is None:
+            return None
+
+        return self._copy_on_write(found_row)
+
+    def rows_after(self, date: datetime.date, inc: bool = False) -> Iterable[row.Row]:
+        return [self._copy_on_write(r) for r in super().rows_after(date, inc)]
+
+    def diff(self) -> list[tuple[datetime.date, row.Row | None, row.Row | None]]:
+        base_rows = {r.date: r for r in self.base.rows}
+        overlay_rows = {r.date: r for r in self.rows}
+
+        changes = []
+        for date in sorted(set(base_rows.keys()) | set(overlay_rows.keys())):
+            before = base_rows.get(date)
+            after = overlay_rows.get(date)
+            if before is after:
+                continue
+
+            if (
+                before is not None
+                and after is not None
+                and before.assignments == after.assignments
+            ):
+                continue
+
+            changes.append((date, before, after))
+
+        return changes
+
+
+def describe_diff(
+    changes: Iterable[tuple[datetime.date, row.Row | None, row.Row | None]]
+) -> str:
+    lines = []
+    for date, before, after in changes:
+        before_assignments = [] if before is None else before.assignments
+        after_assignments = [] if after is None else after.assignments
+
+        lines.append(printable.human_readable_date(date, True))
+        for a in before_assignments:
+            if a not in after_assignments:
+                lines.append(f"  - {a.chore.name}: {str(a)}")
+
+        for a in after_assignments:
+            if a not in before_assignments:
+                lines.append(f"  + {a.chore.name}: {str(a)}")
+
+    return "\n".join(lines)
@@ -0,0 +1,218 @@
+import csv
+import datetime
+import json
+import logging
+import os
+from typing import Iterable, Iterator
+from rotafy.config import chore, person
+from rotafy.rota import assignment, rota, row
+
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("date", "chore", "person", "trainee", "notification_sent")
+MAX_REPORTED_ERRORS = 20
+
+
+class UnsupportedRecordsFile(Exception):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(
+            f"Cannot read or write records in {file_path}. Must be a .csv or .jsonl file."
+        )
+
+
+class InvalidRecords(Exception):
+    def __init__(self, errors: list[tuple[int, str]]) -> None:
+        self.errors = errors
+        lines = [
+            f"  Record {n}: {reason}" for n, reason in errors[:MAX_REPORTED_ERRORS]
+        ]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"  ... and {len(errors) - MAX_REPORTED_ERRORS} more")
+
+        super().__init__(f"{len(errors)} invalid records:\n" + "\n".join(lines))
+
+
+def _format(file_path: str) -> str:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in (".csv", ".jsonl"):
+        raise UnsupportedRecordsFile(file_path)
+
+    return extension
+
+
+def to_record(a: assignment.Assignment) -> dict:
+    return {
+        "date": a.date.isoformat(),
+        "chore": a.chore.name,
+        "person": a.person.name,
+        "trainee": None if a.trainee is None else a.trainee.name,
+        "notification_sent": a.notification_sent,
+    }
+
+
+def write_records(assignments: Iterable[assignment.Assignment], file_path: str) -> int:
+    # Assignments are written as they are read, so an export never holds more
+    # than one record in memory.
+    extension = _format(file_path)
+    written = 0
+    with open(file_path, "w", newline="") as f:
+        if extension == ".csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for a in assignments:
+                record = to_record(a)
+                if record["trainee"] is None:
+                    record["trainee"] = ""
+
+                writer.writerow(record)
+                written += 1
+        else:
+            for a in assignments:
+                f.write(json.dumps(to_record(a)) + "\n")
+                written += 1
+
+    logger.info("Wrote %s records to %s", written, file_path)
+    return written
+
+
+def read_records(file_path: str) -> Iterator[dict]:
+    extension = _format(file_path)
+    with open(file_path, newline="") as f:
+        if extension == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if len(line.strip()) > 0:
+                    yield json.loads(line)
+
+
+def _parse_flag(value: str | bool | None) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    return str(value or "").strip().lower() in ("true", "yes", "1")
+
+
+def build_rows(
+    existing_rota: rota.Rota,
+    records: Iterable[dict],
+    chores: Iterable[chore.Chore],
+    people: Iterable[person.Person],
+) -> list[row.Row]:
+    # Every record is checked before anything is returned, so a file is either
+    # imported completely or not at all. Imported assignments replace the same
+    # chore on the same date and keep any other chores already on that date.
+    chores_by_name = {c.name.lower(): c for c in chores}
+    people_by_name = {p.name.lower(): p for p in people}
+
+    errors = []
+    imported = {}
+    for n, record in enumerate(records, start=1):
+        try:
+            date = datetime.date.fromisoformat(str(record.get("date") or "").strip())
+        except ValueError:
+            errors.append((n, f"{record.get('date')!r} is not a YYYY-MM-DD date"))
+            continue
+
+        chore_name = str(record.get("chore") or "").strip()
+        person_name = str(record.get("person") or "").strip()
+        trainee_name = str(record.get("trainee") or "").strip()
+        if chore_name.lower() not in chores_by_name:
+            errors.append((n, str(chore.ChoreNotFound(chore_name))))
+            continue
+
+        if len(person_name) == 0:
+            errors.append((n, "a person is required"))
+            continue
+
+        missing = [
+            name
+            for name in (person_name, trainee_name)
+            if len(name) > 0 and name.lower() not in people_by_name
+        ]
+        if len(missing) > 0:
+            errors.append((n, str(person.PersonNotFound(missing[0]))))
+            continue
+
+        try:
+            new_assignment = assignment.Assignment(
+                date,
+                chores_by_name[chore_name.lower()],
+                people_by_name[person_name.lower()],
+                people_by_name.get(trainee_name.lower()),
+                _parse_flag(record.get("notification_sent")),
+            )
+        except (
+            assignment.NotQualified,
+            assignment.PersonUnavailable,
+            assignment.ChoreNotScheduled,
+        ) as e:
+            errors.append((n, str(e)))
+            continue
+
+        assignments_by_chore = imported.setdefault(date, {})
+        if new_assignment.chore in assignments_by_chore:
+            first, _ = assignments_by_chore[new_assignment.chore]
+            errors.append(
+                (
+                    n,
+                    f"{new_assignment.chore.name} on {date} is already in record {first}",
+                )
+            )
+            continue
+
+        assignments_by_chore[new_assignment.chore] = (n, new_assignment)
+
+    new_rows = []
+    for date, assignments_by_chore in sorted(imported.items(), key=lambda i: i[0]):
+        existing_row = existing_rota[date]
+        kept_assignments = []
+        if existing_row is not None:
+            kept_assignments = [
+                a
+                for a in existing_row.assignments
+                if a.chore not in assignments_by_chore
+            ]
+
+        try:
+            new_rows.append(
+                row.Row(
+                    kept_assignments + [a for _, a in assignments_by_chore.values()]
+                )
+            )
+        except (row.ChoreAssignedMultipleTimes, row.PersonAssignedMultipleTimes) as e:
+            errors.append((min(n for n, _ in assignments_by_chore.values()), str(e)))
+
+    if len(errors) > 0:
+        raise InvalidRecords(sorted(errors))
+
+    return new_rows
+
+
+def merge_records(
+    existing_rota: rota.Rota,
+    records: Iterable[dict],
+    chores: Iterable[chore.Chore],
+    people: Iterable[person.Person],
+) -> int:
+    # Adds the imported rows without saving, for callers that decide when the
+    # rota is saved.
+    new_rows = build_rows(existing_rota, records, chores, people)
+    for new_row in new_rows:
+        existing_rota.add_row(new_row)
+
+    return len(new_rows)
+
+
+def import_records(
+    existing_rota: rota.Rota,
+    records: Iterable[dict],
+    chores: Iterable[chore.Chore],
+    people: Iterable[person.Person],
+) -> int:
+    with existing_rota.lock():
+        imported = merge_records(existing_rota, records, chores, people)
+        existing_rota.save()
+
+    return imported
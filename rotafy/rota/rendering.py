@@ -0,0 +1,98 @@
+import concurrent.futures
+import datetime
+import logging
+import os
+import matplotlib
+import pandas
+from typing import Iterable
+from rotafy.rota import printable
+
+
+logger = logging.getLogger(__name__)
+
+
+class RenderJob:
+    def __init__(self, dataframe: pandas.DataFrame, output_file: str) -> None:
+        self.dataframe = dataframe
+        self.output_file = output_file
+
+    def __repr__(self) -> str:
+        return f"RenderJob({len(self.dataframe)} rows, {repr(self.output_file)})"
+
+
+def _initialise_worker() -> None:
+    # Workers only ever write files, so they use the non-interactive backend.
+    # matplotlib is set up once per worker, not once per page.
+    matplotlib.use("Agg", force=True)
+
+
+def render_job(job: RenderJob) -> str | None:
+    if not printable.write_pdf(job.dataframe, job.output_file):
+        logger.info("Nothing to render to %s", job.output_file)
+        return None
+
+    logger.info("Rendered %s", job.output_file)
+    return job.output_file
+
+
+def render(
+    jobs: Iterable[RenderJob], max_workers: int | None = None
+) -> list[str | None]:
+    # The tables are built in this process, which is cheap, and only the
+    # drawing and writing of each PDF is done in the pool.
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_initialise_worker
+    ) as executor:
+        return list(executor.map(render_job, jobs))
+
+
+def rota_jobs(
+    rotas: Iterable[printable.PrintableRota], output_directory: str
+) -> list[RenderJob]:
+    return [
+        RenderJob(r.dataframe, os.path.join(output_directory, f"{r.name}.pdf"))
+        for r in rotas
+    ]
+
+
+def month_jobs(
+    r: printable.PrintableRota,
+    output_directory: str,
+    start: datetime.date,
+    end: datetime.date,
+) -> list[RenderJob]:
+    # One page per calendar month from the month of start to the month of end.
+    jobs = []
+    first_of_month = start.replace(day=1)
+    while first_of_month <= end:
+        next_month = (first_of_month + datetime.timedelta(days=32)).replace(day=1)
+        last_of_month = next_month - datetime.timedelta(days=1)
+        output_file = os.path.join(
+            output_directory, f"{r.name}-{first_of_month.strftime('%Y-%m')}.pdf"
+        )
+        jobs.append(
+            RenderJob(r.dataframe_between(first_of_month, last_of_month), output_file)
+        )
+        first_of_month = next_month
+
+    return jobs
+
+
+def render_rotas(
+    rotas: Iterable[printable.PrintableRota],
+    output_directory: str,
+    max_workers: int | None = None,
+) -> list[str | None]:
+    os.makedirs(output_directory, exist_ok=True)
+    return render(rota_jobs(rotas, output_directory), max_workers)
+
+
+def render_months(
+    r: printable.PrintableRota,
+    output_directory: str,
+    start: datetime.date,
+    end: datetime.date,
+    max_workers: int | None = None,
+) -> list[str | None]:
+    os.makedirs(output_directory, exist_ok=True)
+    return render(month_jobs(r, output_directory, start, end), max_workers)
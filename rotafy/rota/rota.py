@@ -1,15 +1,26 @@
+import bisect
 import datetime
+import gzip
 import logging
-import pkg_resources
 import os
 import pickle
 import copy
-from typing import Iterable
-from rotafy.rota import row
+import contextlib
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator
+from rotafy.config import chore
+from rotafy.rota import assignment, row
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rotas")
+
 
 class MismatchedDates(Exception):
     def __init__(self, set_date: datetime.date, new_date: datetime.date) -> None:
@@ -18,22 +29,76 @@ class MismatchedDates(Exception):
         )
 
 
+class RotaModified(Exception):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(
+            f"{file_path} has been modified by another process since it was loaded. Try again."
+        )
+
+
+def replace_atomically(file_path: str, write: Callable[[BinaryIO], None]) -> None:
+    # Write to a temporary file and rename it over the original so readers
+    # never see a partially written file.
+    directory = os.path.dirname(file_path) or "."
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(file_path)}."
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise
+
+
+def _add_training_counts(
+    counts: dict[str, dict[str, int]], rows: Iterable[row.Row]
+) -> dict[str, dict[str, int]]:
+    for r in rows:
+        for a in r.assignments:
+            if a.trainee is None:
+                continue
+
+            trainee_counts = counts.setdefault(a.trainee.name, {})
+            trainee_counts[a.chore.name] = trainee_counts.get(a.chore.name, 0) + 1
+
+    return counts
+
+
 class Rota:
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, directory: str | None = None) -> None:
         self.name = name
-        self.file_path = pkg_resources.resource_filename(
-            __name__, f"/rotas/{self.name}.pkl"
-        )
+        if directory is None:
+            directory = DEFAULT_DIRECTORY
+
+        self.file_path = os.path.join(directory, f"{self.name}.pkl")
+        self._by_date = {}
+        self._by_person = {}
+        self._by_chore = {}
+        self._index_keys = {}
+        self._training_keys = {}
+        self._unsent = []
+        self._journal = None
+        self.training = {}
+        self.archived_training = {}
+        self.archived_until = None
         self.rows = []
+        self.version = None
+        self._version_path = None
+        self._lock_file = None
+        self._lock_depth = 0
         self.load()
         self.sort()
 
     def __getitem__(self, date: datetime.date) -> row.Row | None:
-        matches = [r for r in self.rows if r.date == date]
-        if len(matches) != 1:
-            return None
-
-        return matches[0]
+        self._record(date)
+        return self._by_date.get(date)
 
     def __setitem__(self, date: datetime.date, new_row: row.Row) -> None:
         if date != new_row.date:
@@ -44,55 +109,485 @@ class Rota:
     def __delitem__(self, date: datetime.date) -> None:
         self.delete_row(date)
 
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        # Re-entrant, so a Manager can hold the lock across a whole load, mutate
+        # and save cycle while the individual saves inside it also lock.
+        if self._lock_depth == 0:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            self._lock_file = open(self.file_path + ".lock", "a")
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+                self._lock_file.close()
+                self._lock_file = None
+
+    @contextlib.contextmanager
+    def journal(self) -> Iterator[None]:
+        # Keeps a copy of each row as it was before it was first handed out or
+        # changed, so that only the rows touched are restored if anything fails.
+        if self._journal is not None:
+            yield
+            return
+
+        self._journal = {}
+        try:
+            yield
+        except BaseException:
+            journal = self._journal
+            self._journal = None
+            for date, original_row in journal.items():
+                if original_row is None:
+                    self.delete_row(date)
+                else:
+                    self.add_row(original_row)
+
+            raise
+        finally:
+            self._journal = None
+
+    def _record(self, date: datetime.date) -> None:
+        if self._journal is not None and date not in self._journal:
+            self._journal[date] = copy.deepcopy(self._by_date.get(date))
+
+    def _current_version(self) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def is_stale(self) -> bool:
+        if self._version_path != self.file_path:
+            return False
+
+        return self._current_version() != self.version
+
     def load(self) -> None:
+        self.version = None
+        self._version_path = self.file_path
         if os.path.exists(self.file_path):
             with open(self.file_path, "rb") as f:
-                self.rows = pickle.load(f)
+                stat = os.fstat(f.fileno())
+                self.version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                data = pickle.load(f)
+
+            # Older rota files are a bare list of rows, without an archive or
+            # training counters, so their counters are counted from the rows
+            # once. Otherwise the saved counters are used as they are.
+            if isinstance(data, list):
+                data = {"rows": data}
+
+            self.archived_training = data.get("archived_training", {})
+            self.archived_until = data.get("archived_until", None)
+            self._rows = list(data["rows"])
+            if "training" in data:
+                self.training = data["training"]
+            else:
+                self.training = self.training_counts()
+
+            self.sort()
 
     def save(self) -> None:
-        if os.path.exists(self.file_path) == False:
-            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        directory = os.path.dirname(self.file_path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        with self.lock():
+            if self.is_stale():
+                raise RotaModified(self.file_path)
+
+            # Training counters are written in the same file as the rows, so the
+            # two can never disagree after a failed save.
+            data = {
+                "rows": self.rows,
+                "training": self.training,
+                "archived_training": self.archived_training,
+                "archived_until": self.archived_until,
+            }
+            replace_atomically(self.file_path, lambda f: pickle.dump(data, f))
+
+            self.version = self._current_version()
+            self._version_path = self.file_path
+
+    def training_counts(self) -> dict[str, dict[str, int]]:
+        # Number of sessions each trainee has had for each chore, by name,
+        # including sessions in rows that have since been archived, counted
+        # from scratch. self.training is kept equal to this as rows change.
+        return _add_training_counts(copy.deepcopy(self.archived_training), self.rows)
+
+    @property
+    def archive_path(self) -> str:
+        return os.path.splitext(self.file_path)[0] + ".archive.gz"
+
+    @property
+    def outbox_path(self) -> str:
+        return os.path.splitext(self.file_path)[0] + ".outbox.json"
+
+    def archived_rows(self) -> Iterator[row.Row]:
+        # The archive is a gzip stream of pickled rows in date order, so it can
+        # be read one row at a time without loading it all.
+        if self.archived_until is None or not os.path.exists(self.archive_path):
+            return
+
+        with gzip.open(self.archive_path, "rb") as archive:
+            while True:
+                try:
+                    archived_row = pickle.load(archive)
+                except EOFError:
+                    return
+
+                # Rows from a compaction that was never saved are still in the
+                # rota itself.
+                if archived_row.date >= self.archived_until:
+                    return
+
+                yield archived_row
+
+    def compact(self, before: datetime.date, keep: int = 0) -> int:
+        # Archive rows dated before the given date, except for the most recent
+        # keep of them. Returns the number of rows archived.
+        with self.lock():
+            if self.is_stale():
+                raise RotaModified(self.file_path)
+
+            self.sort()
+            old_rows = [r for r in self.rows if r.date < before]
+            old_rows = old_rows[: max(0, len(old_rows) - keep)]
+            if len(old_rows) == 0:
+                return 0
+
+            logger.info(
+                "Archiving %s rows from before %s to %s",
+                len(old_rows),
+                old_rows[-1].date + datetime.timedelta(days=1),
+                self.archive_path,
+            )
+
+            def write(f: BinaryIO) -> None:
+                with gzip.GzipFile(fileobj=f, mode="wb") as archive:
+                    for r in self.archived_rows():
+                        pickle.dump(r, archive)
+
+                    for r in old_rows:
+                        pickle.dump(r, archive)
+
+            replace_atomically(self.archive_path, write)
 
-        with open(self.file_path, "wb") as f:
-            pickle.dump(self.rows, f)
+            self.archived_training = _add_training_counts(
+                self.archived_training, old_rows
+            )
+            self.archived_until = old_rows[-1].date + datetime.timedelta(days=1)
+            self.rows = self.rows[len(old_rows) :]
+            self.save()
+
+        return len(old_rows)
+
+    @property
+    def rows(self) -> list[row.Row]:
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows: Iterable[row.Row]) -> None:
+        self._rows = list(rows)
+        self.training = self.training_counts()
+        self.sort()
 
     def sort(self) -> None:
-        self.rows.sort(key=lambda r: r.date)
+        # Rows are kept in date order and indexed by date, person and chore.
+        # Anything that changes rows other than through add_row and delete_row
+        # must sort again to rebuild the indexes. The training counters are
+        # left as they are.
+        self._rows.sort(key=lambda r: r.date)
+        self._by_date = {}
+        self._by_person = {}
+        self._by_chore = {}
+        self._index_keys = {}
+        self._training_keys = {}
+        self._unsent = []
+        for r in self._rows:
+            self._index(r)
+
+    def _index(self, indexed_row: row.Row) -> None:
+        # The keys are kept so that a row can be unindexed even after its
+        # assignments have been changed in place.
+        keys = _index_keys(indexed_row)
+        self._by_date[indexed_row.date] = indexed_row
+        self._index_keys[indexed_row.date] = keys
+        for person_name, chore_name in keys:
+            if person_name is not None:
+                dates = self._by_person.setdefault(person_name, [])
+            else:
+                dates = self._by_chore.setdefault(chore_name, [])
+
+            bisect.insort(dates, indexed_row.date)
+
+        if any(a.notification_sent == False for a in indexed_row.assignments):
+            bisect.insort(self._unsent, indexed_row.date)
+
+        training_keys = [
+            (a.trainee.name, a.chore.name)
+            for a in indexed_row.assignments
+            if a.trainee is not None
+        ]
+        self._training_keys[indexed_row.date] = training_keys
+
+    def _unindex(self, date: datetime.date) -> None:
+        del self._by_date[date]
+        i = bisect.bisect_left(self._unsent, date)
+        if i < len(self._unsent) and self._unsent[i] == date:
+            del self._unsent[i]
+
+        for person_name, chore_name in self._index_keys.pop(date):
+            if person_name is not None:
+                dates = self._by_person[person_name]
+            else:
+                dates = self._by_chore[chore_name]
+
+            del dates[bisect.bisect_left(dates, date)]
+
+        del self._training_keys[date]
+
+    def _count_training(self, date: datetime.date, sessions: int) -> None:
+        for trainee_name, chore_name in self._training_keys[date]:
+            trainee_counts = self.training.setdefault(trainee_name, {})
+            trainee_counts[chore_name] = trainee_counts.get(chore_name, 0) + sessions
+            if trainee_counts[chore_name] == 0:
+                del trainee_counts[chore_name]
+
+            if len(trainee_counts) == 0:
+                del self.training[trainee_name]
 
     def add_row(self, new_row: row.Row) -> None:
-        new_row_s = [f"{a.chore.name}: {str(a)}" for a in new_row.assignments]
-        logger.info(f"Adding row {', '.join(new_row_s)} to {new_row.date}")
+        if logger.isEnabledFor(logging.INFO):
+            new_row_s = [f"{a.chore.name}: {str(a)}" for a in new_row.assignments]
+            logger.info("Adding row %s to %s", ", ".join(new_row_s), new_row.date)
 
-        all_row_dates = set(r.date for r in self.rows)
-        if new_row.date in all_row_dates:
+        self._record(new_row.date)
+        if new_row.date in self._by_date:
             self.delete_row(new_row.date)
 
-        self.rows.append(copy.deepcopy(new_row))
-        self.sort()
+        new_row = copy.deepcopy(new_row)
+        bisect.insort(self._rows, new_row, key=lambda r: r.date)
+        self._index(new_row)
+        self._count_training(new_row.date, 1)
 
     def delete_row(self, date: datetime.date) -> None:
-        logger.info(f"Deleting row from {date}")
-        self.rows = [row for row in self.rows if row.date != date]
+        logger.info("Deleting row from %s", date)
+        self._record(date)
+        if date not in self._by_date:
+            return
 
-    def rows_prior(self, date: datetime.date, inc: bool = False) -> Iterable[row.Row]:
-        self.sort()
+        del self._rows[self._position(date)]
+        self._count_training(date, -1)
+        self._unindex(date)
+
+    def set_assignment(self, new_assignment: assignment.Assignment) -> None:
+        # Replaces the row rather than changing it in place, so the indexes
+        # stay up to date.
+        existing_row = self[new_assignment.date]
+        kept_assignments = []
+        if existing_row is not None:
+            kept_assignments = [
+                a for a in existing_row.assignments if a.chore != new_assignment.chore
+            ]
 
+        self.add_row(row.Row(kept_assignments + [new_assignment]))
+
+    def delete_assignment(self, date: datetime.date, chore: chore.Chore) -> None:
+        existing_row = self[date]
+        if existing_row is None:
+            return
+
+        kept_assignments = [a for a in existing_row.assignments if a.chore != chore]
+        if len(kept_assignments) == 0:
+            self.delete_row(date)
+        else:
+            self.add_row(row.Row(kept_assignments))
+
+    def _position(self, date: datetime.date, inc: bool = True) -> int:
+        # Index of the first row on (or, if not inc, after) the date.
         if inc:
-            return [row for row in self.rows if row.date <= date]
+            return bisect.bisect_left(self._rows, date, key=lambda r: r.date)
 
-        return [row for row in self.rows if row.date < date]
+        return bisect.bisect_right(self._rows, date, key=lambda r: r.date)
+
+    def rows_prior(self, date: datetime.date, inc: bool = False) -> Iterable[row.Row]:
+        return self._rows[: self._position(date, not inc)]
 
     def rows_after(self, date: datetime.date, inc: bool = False) -> Iterable[row.Row]:
-        self.sort()
+        rows = self._rows[self._position(date, inc) :]
+        if self._journal is not None:
+            for r in rows:
+                self._record(r.date)
 
-        if inc:
-            return [row for row in self.rows if row.date >= date]
+        return rows
+
+    def person_dates(
+        self,
+        person_name: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[datetime.date]:
+        # Dates between start and end inclusive that the person is assigned to,
+        # or is training on.
+        return _dates_between(self._by_person.get(person_name, []), start, end)
+
+    def chore_dates(
+        self,
+        chore_name: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[datetime.date]:
+        return _dates_between(self._by_chore.get(chore_name, []), start, end)
+
+    def unsent_assignments(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[assignment.Assignment]:
+        # Assignments between start and end inclusive that have not been
+        # notified, in date order. Assignments are marked as notified in place,
+        # so dates with nothing left to send are dropped from the index here.
+        unsent_assignments = []
+        for date in _dates_between(self._unsent, start, end):
+            unsent = [
+                a
+                for a in self._by_date[date].assignments
+                if a.notification_sent == False
+            ]
+            if len(unsent) == 0:
+                del self._unsent[bisect.bisect_left(self._unsent, date)]
+
+            unsent_assignments.extend(unsent)
+
+        return unsent_assignments
+
+    def person_assignments(
+        self,
+        person_name: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[assignment.Assignment]:
+        return [
+            a
+            for date in self.person_dates(person_name, start, end)
+            for a in _matching_assignments(self._by_date[date], person_name, None)
+        ]
+
+    def chore_assignments(
+        self,
+        chore_name: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[assignment.Assignment]:
+        return [
+            a
+            for date in self.chore_dates(chore_name, start, end)
+            for a in _matching_assignments(self._by_date[date], None, chore_name)
+        ]
+
+    def iter_rows(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        person_name: str | None = None,
+        chore_name: str | None = None,
+    ) -> Iterator[row.Row]:
+        # Rows between start and end inclusive, in date order, that have an
+        # assignment matching the person (or trainee) and chore if given.
+        # Archived rows are streamed from the archive only if the range needs
+        # them.
+        if self.archived_until is not None and (
+            start is None or start < self.archived_until
+        ):
+            for r in self.archived_rows():
+                if end is not None and r.date > end:
+                    return
+
+                if start is not None and r.date < start:
+                    continue
+
+                if _matching_assignments(r, person_name, chore_name):
+                    yield r
+
+        first = 0
+        if start is not None:
+            first = self._position(start)
+
+        for r in self._rows[first:]:
+            if end is not None and r.date > end:
+                return
 
-        return [row for row in self.rows if row.date > date]
+            if _matching_assignments(r, person_name, chore_name):
+                yield r
+
+    def iter_assignments(
+        self,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        person_name: str | None = None,
+        chore_name: str | None = None,
+    ) -> Iterator[assignment.Assignment]:
+        for r in self.iter_rows(start, end, person_name, chore_name):
+            yield from _matching_assignments(r, person_name, chore_name)
 
     @property
     def latest_date(self) -> datetime.date:
         if len(self.rows) == 0:
             return datetime.date.today()
 
-        return max(row.date for row in self.rows)
+        return self._rows[-1].date
+
+
+def _matching_assignments(
+    row_to_check: row.Row, person_name: str | None, chore_name: str | None
+) -> list[assignment.Assignment]:
+    matches = []
+    for a in row_to_check.assignments:
+        if chore_name is not None and a.chore.name != chore_name:
+            continue
+
+        if person_name is not None:
+            names = [a.person.name]
+            if a.trainee is not None:
+                names.append(a.trainee.name)
+
+            if person_name not in names:
+                continue
+
+        matches.append(a)
+
+    return matches
+
+
+def _index_keys(indexed_row: row.Row) -> set[tuple[str | None, str | None]]:
+    # (person name, None) for everyone on the row and (None, chore name) for
+    # every chore, without duplicates.
+    keys = set()
+    for a in indexed_row.assignments:
+        keys.add((a.person.name, None))
+        keys.add((None, a.chore.name))
+        if a.trainee is not None:
+            keys.add((a.trainee.name, None))
+
+    return keys
+
+
+def _dates_between(
+    dates: list[datetime.date],
+    start: datetime.date | None,
+    end: datetime.date | None,
+) -> list[datetime.date]:
+    first = 0 if start is None else bisect.bisect_left(dates, start)
+    last = len(dates) if end is None else bisect.bisect_right(dates, end)
+    return dates[first:last]
@@ -0,0 +1,63 @@
+import pytest
+import datetime
+from rotafy.api import eligibility, manager
+from rotafy.config import chore, person
+
+
+today = datetime.date.today()
+tomorrow = today + datetime.timedelta(days=1)
+dishes = chore.Chore("Dishes", 0, "Daily", False, 1, 0)
+hoovering = chore.Chore("Hoovering", 1, "Daily", False, 1, 1)
+
+
+@pytest.fixture
+def people():
+    return [
+        person.Person("Ryan", [dishes, hoovering]),
+        person.Person("Mark", [dishes], "", [today], [hoovering]),
+        person.Person("Matthew", [hoovering], "", [], [dishes]),
+    ]
+
+
+@pytest.fixture
+def test_index(people):
+    return eligibility.EligibilityIndex(people, [dishes, hoovering])
+
+
+def test_init(test_index):
+    assert [p.name for p in test_index.people] == ["Mark", "Matthew", "Ryan"]
+    assert test_index.qualified[dishes] == 0b101
+    assert test_index.learning[dishes] == 0b010
+    assert test_index.unavailable == {today: 0b001}
+
+
+def test_available(test_index):
+    assert test_index.available(today) == 0b110
+    assert test_index.available(tomorrow) == 0b111
+
+
+def test_can_do(test_index, people):
+    assert [p.name for p in test_index.can_do(dishes, today)] == ["Ryan"]
+    assert [p.name for p in test_index.can_do(dishes, tomorrow)] == ["Mark", "Ryan"]
+    assert test_index.can_do(chore.Chore("Other", 2, "Daily", False, 1, 1), today) == []
+
+    for c in (dishes, hoovering):
+        for date in (today, tomorrow):
+            expected = [p for p in test_index.people if p.can_do(c, date)]
+            assert test_index.can_do(c, date) == expected
+
+
+def test_can_be_trained(test_index):
+    assert [p.name for p in test_index.can_be_trained(dishes, today)] == ["Matthew"]
+    assert test_index.can_be_trained(hoovering, today) == []
+    assert [p.name for p in test_index.can_be_trained(hoovering, tomorrow)] == ["Mark"]
+
+
+def test_update(test_index, people):
+    matthew = people[2]
+    matthew.add_to_experience(dishes)
+    assert test_index.can_be_trained(dishes, today) == [matthew]
+
+    test_index.update(matthew)
+    assert test_index.can_be_trained(dishes, today) == []
+    assert matthew in test_index.can_do(dishes, today)
@@ -1,7 +1,8 @@
 import pytest
 import datetime
+import os
 from unittest.mock import Mock, patch
-from rotafy.api import manager
+from rotafy.api import manager, notifier, outbox, profiling, transport
 from rotafy.config import config, chore, person
 from rotafy.rota import printable, assignment, row
 
@@ -213,3 +214,214 @@ def test_fill(sample_manager):
     assert len(sample_manager.rota.rows) > 0
     for row in sample_manager.rota.rows:
         assert len(row.assignments) > 0
+
+
+@pytest.fixture
+def dry_run_manager(tmp_path):
+    return manager.Manager(
+        "tests/rota/loadable_config.toml", str(tmp_path), dry_run=True
+    )
+
+
+def test_dry_run(dry_run_manager, tmp_path):
+    assert os.listdir(tmp_path) == []
+    assert len(dry_run_manager.rota.rows) > 0
+    assert len(dry_run_manager.plan()) == len(dry_run_manager.rota.rows)
+    assert all(before is None for _, before, _ in dry_run_manager.plan())
+
+    dry_run_manager.notify()
+    assert os.listdir(tmp_path) == []
+
+
+def test_seed(tmp_path):
+    seeded = [
+        manager.Manager(
+            "tests/rota/loadable_config.toml", str(tmp_path), dry_run=True, seed=7
+        )
+        for _ in range(2)
+    ]
+    assert seeded[0].seed == 7
+    for first, second in zip(seeded[0].rota.rows, seeded[1].rota.rows):
+        assert first.assignments == second.assignments
+
+
+def test_seed_backtracking(tmp_path):
+    # First is a tie between both people, but picking Both leaves no one for
+    # Second, so the retry after backtracking must not repeat the same draw.
+    fp = os.path.join(tmp_path, "tie.toml")
+    with open(fp, "w") as f:
+        f.write(
+            'name = "tie"\nlookahead_days = 0\n'
+            '[[chore]]\nname = "First"\nrecurrence = "Daily"\n'
+            '[[chore]]\nname = "Second"\nrecurrence = "Daily"\n'
+            '[[person]]\nname = "Both"\nskills = ["ALL"]\n'
+            '[[person]]\nname = "One"\nskills = ["First"]\n'
+        )
+
+    for seed in (1, 2, 3, 6, 7):
+        m = manager.Manager(fp, str(tmp_path / str(seed)), seed=seed)
+        today_row = m.rota[datetime.date.today()]
+        assert [str(a) for a in today_row.assignments] == ["One", "Both"]
+
+
+def test_excluded_people(dry_run_manager):
+    next_saturday = datetime.date.today()
+    while next_saturday.weekday() != 5:
+        next_saturday += datetime.timedelta(days=1)
+
+    dishes, hoovering = sorted(
+        dry_run_manager.configuration.chores, key=lambda c: c.name
+    )
+    ryan = next(p for p in dry_run_manager.configuration.people if p.name == "Ryan")
+    choices = dry_run_manager.all_independently_valid_assignments(
+        next_saturday, hoovering, [ryan]
+    )
+    assert len(choices) > 0
+    assert all(a.person != ryan and a.trainee != ryan for a in choices)
+    assert dry_run_manager.valid_choices(next_saturday, hoovering, [ryan]) == [
+        (a.person, a.trainee) for a in choices
+    ]
+    for r in dry_run_manager.rota.rows:
+        assert len(set(a.person for a in r.assignments)) == len(r.assignments)
+
+
+def test_training_counters(tmp_path):
+    first = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+    second = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+    assert first.rota.training == first.rota.training_counts()
+    assert second.rota.training == first.rota.training
+    for p1, p2 in zip(
+        sorted(first.configuration.people, key=lambda p: p.name),
+        sorted(second.configuration.people, key=lambda p: p.name),
+    ):
+        assert p1.experience == p2.experience
+        assert p1.skills == p2.skills
+
+
+def test_compact(tmp_path):
+    m = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+    assert m.compact() == 0
+    assert os.path.exists(m.rota.archive_path) == False
+
+
+def test_profiled_phases(tmp_path):
+    with profiling.profile() as profiler:
+        manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+
+    for phase in ("fill", "all_independently_valid_assignments", "row_weight"):
+        assert profiler.calls[phase] > 0
+
+
+def test_batch(tmp_path):
+    m = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+    # Only Dishes is due on weekdays.
+    today = datetime.date.today()
+    while today.weekday() >= 5:
+        today += datetime.timedelta(days=1)
+
+    rows = [str(a) for r in m.rota.rows for a in r.assignments]
+    with profiling.profile() as profiler:
+        with m.batch():
+            with m.batch():
+                m.add_person(today, "Dishes", "Ryan")
+
+            m._save()
+            assert profiler.counters["saves"] == 0
+
+    assert profiler.counters["saves"] == 1
+
+    with pytest.raises(manager.PersonNotAssigned):
+        with m.batch():
+            m.add_person(today, "Dishes", "Mark")
+            m.remove_person(today, "Ryan")
+
+    assert m.find_assignment(today, "Ryan") is not None
+    assert len([a for r in m.rota.rows for a in r.assignments]) == len(rows)
+
+
+def test_notify_outbox(tmp_path, monkeypatch):
+    class FailingTransport(transport.MemoryTransport):
+        def __init__(self, failures):
+            super().__init__()
+            self.failures = failures
+
+        def send(self, messages):
+            statuses = super().send(messages)
+            if self.failures > 0:
+                self.failures -= 1
+                statuses[0] = "INVALID_RECIPIENT"
+
+            return statuses
+
+    monkeypatch.setattr(manager, "NOTIFY_DELAY", 0)
+    m = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+
+    # Only the failed message is retried, within the same round.
+    m.notifier.transport = FailingTransport(1)
+    m.notify()
+    first_round = m.notifier.transport.sent[:-1]
+    assert len(first_round) > 1
+    assert m.notifier.transport.sent[-1] == first_round[0]
+    assert len(m.outbox.unsent()) == 0
+    retried = m.outbox.entries[first_round[0].message_id]
+    assert retried.attempts == 2
+    assert all(e.attempts == 1 for e in m.outbox.entries.values() if e is not retried)
+    assert os.path.exists(m.rota.outbox_path)
+
+    for r in m.rota.rows:
+        for a in r.assignments:
+            a.notification_sent = False
+
+    m.rota.sort()
+
+    # A message that fails every try is left in the outbox for the next round.
+    os.remove(m.rota.outbox_path)
+    m.notifier.transport = FailingTransport(manager.NOTIFY_TRIES)
+    with pytest.raises(notifier.APIStatusNotSuccessful):
+        m.notify()
+
+    sent = m.notifier.transport.sent
+    assert len(sent) == len(first_round) + manager.NOTIFY_TRIES - 1
+    failed = [e for e in m.outbox.entries.values() if e.status == outbox.FAILED]
+    assert [e.message for e in failed] == sent[:1]
+    assert failed[0].attempts == manager.NOTIFY_TRIES
+
+    m.notifier.transport = transport.MemoryTransport()
+    m.notify()
+    assert m.notifier.transport.sent == sent[:1]
+
+    m.notify()
+    assert m.notifier.transport.sent == sent[:1]
+    assert all(
+        a.notification_sent
+        for r in m.rota.rows_prior(datetime.date.today(), True)
+        for a in r.assignments
+    )
+
+
+def test_eligibility(tmp_path):
+    m = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+    index = m.eligibility
+    assert m.eligibility is index
+
+    mark = person.find_person("Mark", m.configuration.people)
+    hoovering = chore.find_chore("Hoovering", m.configuration.chores)
+    next_saturday = datetime.date.today() + datetime.timedelta(days=7)
+    while next_saturday.weekday() != 5:
+        next_saturday += datetime.timedelta(days=1)
+
+    assert mark not in index.can_do(hoovering, next_saturday)
+    m._add_to_experience(mark, hoovering, 10)
+    assert mark in index.can_do(hoovering, next_saturday)
+    assert mark not in index.can_be_trained(hoovering, next_saturday)
+
+    m._reduce_experience(mark, hoovering)
+    assert mark not in index.can_do(hoovering, next_saturday)
+    assert mark in index.can_be_trained(hoovering, next_saturday)
+
+    with pytest.raises(ValueError):
+        with m.batch():
+            m._add_to_experience(mark, hoovering, 10)
+            raise ValueError
+
+    assert mark not in index.can_do(hoovering, next_saturday)
@@ -1,11 +1,10 @@
 import pytest
-import clicksend_client
 import jinja2
 import datetime
 from rotafy.rota import printable, assignment
 from rotafy.config.chore import Chore
 from rotafy.config.person import Person
-from rotafy.api import notifier
+from rotafy.api import notifier, transport
 
 
 all_chores = [
@@ -37,15 +36,14 @@ def no_trainee_assignment():
 @pytest.fixture
 def test_notifier():
     n = notifier.Notifier(
-        "test1@test.com",
-        "D83DED51-9E35-4D42-9BB9-0E34B7CA85AE",
+        transport.MemoryTransport(),
         "Hi {{recipient}}! On {{date}}, {{chore}} will be handled by {{assignment}}.",
     )
     return n
 
 
 def test_init(test_notifier):
-    assert isinstance(test_notifier.clicksend_api, clicksend_client.SMSApi)
+    assert isinstance(test_notifier.transport, transport.MemoryTransport)
     assert isinstance(test_notifier.template, jinja2.Template)
     assert len(test_notifier.queue) == 0
 
@@ -69,9 +67,10 @@ def test_format_upcoming_date(test_notifier):
 def test_add_to_queue(test_notifier, test_assignment):
     assert len(test_notifier.queue) == 0
 
-    test_notifier.add_to_queue(person, test_assignment)
-    assert len(test_notifier.queue) == 1
-    assert isinstance(test_notifier.queue[0], clicksend_client.SmsMessage)
+    m = test_notifier.add_to_queue(person, test_assignment)
+    assert test_notifier.queue == [m]
+    assert m.message_id == f"{tomorrow.isoformat()}/test_chore/person"
+    assert isinstance(test_notifier.queue[0], transport.Message)
     assert test_notifier.queue[0].source == "Rotafy"
     assert len(test_notifier.queue[0].body) > 0
     assert test_notifier.queue[0].to == person.telephone
@@ -93,3 +92,46 @@ def test_message_from_assignment(test_notifier, test_assignment, no_trainee_assi
     assert len(test_notifier.queue) == 3
     recipients = [m.to for m in test_notifier.queue]
     assert no_trainee_assignment.person.telephone in recipients
+
+
+def test_compile_template(test_notifier):
+    other_notifier = notifier.Notifier(
+        transport.MemoryTransport(),
+        "Hi {{recipient}}! On {{date}}, {{chore}} will be handled by {{assignment}}.",
+    )
+    assert other_notifier.template is test_notifier.template
+    assert notifier.compile_template("{{chore}}") is not test_notifier.template
+
+
+def test_format_upcoming_date_memoised(test_notifier):
+    week_away = datetime.date.today() + datetime.timedelta(days=7)
+    formatted = test_notifier.format_upcoming_date(week_away)
+    assert test_notifier.format_upcoming_date(week_away) is formatted
+    assert len(test_notifier._formatted_dates) == 1
+
+
+def test_send(test_notifier, test_assignment):
+    test_notifier.send()
+    assert len(test_notifier.transport.sent) == 0
+
+    messages = test_notifier.message_from_assignment(test_assignment)
+    assert messages == test_notifier.queue
+    statuses = test_notifier.send()
+    assert test_notifier.transport.sent == messages
+    assert statuses == {m.message_id: "SUCCESS" for m in messages}
+    assert len(test_notifier.queue) == 0
+
+
+def test_send_unsuccessful(test_notifier, test_assignment):
+    class FailingTransport(transport.Transport):
+        def send(self, messages):
+            return ["SUCCESS"] + ["INVALID_RECIPIENT"] * (len(messages) - 1)
+
+    test_notifier.transport = FailingTransport()
+    messages = test_notifier.message_from_assignment(test_assignment)
+    with pytest.raises(notifier.APIStatusNotSuccessful) as e:
+        test_notifier.send()
+
+    assert e.value.statuses[messages[0].message_id] == "SUCCESS"
+    assert e.value.statuses[messages[1].message_id] == "INVALID_RECIPIENT"
+    assert test_notifier.queue == messages[1:]
@@ -0,0 +1,144 @@
+import pytest
+import datetime
+import json
+import os
+from rotafy.api import manager, operations, profiling
+
+
+@pytest.fixture
+def test_manager(tmp_path):
+    return manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+
+
+@pytest.fixture
+def weekdays():
+    # Only Dishes is due on weekdays, so anyone can be assigned it alone.
+    today = datetime.date.today()
+    dates = [today + datetime.timedelta(days=i) for i in range(1, 10)]
+    return [d for d in dates if d.weekday() < 5][:2]
+
+
+def test_parse_operation():
+    o = operations.parse_operation(
+        1,
+        {
+            "action": "Swap",
+            "date": "2030-01-02",
+            "person": "Ryan",
+            "other_person": "Mark",
+        },
+    )
+    assert o.action == "swap"
+    assert o.date == datetime.date(2030, 1, 2)
+    assert o.arguments == ("Ryan", "Mark")
+
+    with pytest.raises(operations.InvalidOperation):
+        operations.parse_operation(2, {"action": "delete", "date": "2030-01-02"})
+
+    with pytest.raises(operations.InvalidOperation):
+        operations.parse_operation(3, {"action": "remove", "date": "2030-01-02"})
+
+    with pytest.raises(operations.InvalidOperation):
+        operations.parse_operation(
+            4, {"action": "remove", "date": "02/01/2030", "person": "Ryan"}
+        )
+
+
+def test_read_operations(tmp_path, weekdays):
+    csv_path = tmp_path / "operations.csv"
+    csv_path.write_text(
+        "action,date,chore,person,other_person\n"
+        f"assign,{weekdays[0]},Dishes,Ryan,\n"
+        f"remove,{weekdays[1]},,Ryan,\n"
+    )
+    json_path = tmp_path / "operations.json"
+    json_path.write_text(
+        json.dumps(
+            [
+                {
+                    "action": "assign",
+                    "date": str(weekdays[0]),
+                    "chore": "Dishes",
+                    "person": "Ryan",
+                },
+                {"action": "remove", "date": str(weekdays[1]), "person": "Ryan"},
+            ]
+        )
+    )
+
+    from_csv = operations.read_operations(str(csv_path))
+    from_json = operations.read_operations(str(json_path))
+    assert [repr(o) for o in from_csv] == [repr(o) for o in from_json]
+    assert [o.action for o in from_csv] == ["assign", "remove"]
+
+    with pytest.raises(operations.UnsupportedOperationsFile):
+        operations.read_operations(str(tmp_path / "operations.txt"))
+
+
+def test_apply_operations(tmp_path, test_manager, weekdays):
+    to_apply = [
+        operations.Operation(1, "assign", weekdays[0], ["Dishes", "Ryan"]),
+        operations.Operation(2, "assign", weekdays[1], ["Dishes", "Ryan"]),
+    ]
+    with profiling.profile() as profiler:
+        operations.apply_operations(test_manager, to_apply)
+
+    assert profiler.counters["saves"] == 1
+    reloaded = manager.Manager("tests/rota/loadable_config.toml", str(tmp_path))
+    for date in weekdays:
+        assert reloaded.find_assignment(date, "Ryan") is not None
+
+
+def test_apply_operations_rollback(test_manager, weekdays):
+    assignments = [str(a) for a in test_manager.rota[weekdays[0]].assignments]
+    modified_time = os.path.getmtime(test_manager.rota.file_path)
+
+    to_apply = [
+        operations.Operation(1, "assign", weekdays[0], ["Dishes", "Ryan"]),
+        operations.Operation(2, "remove", weekdays[1], ["Nobody"]),
+    ]
+    with pytest.raises(operations.InvalidOperation):
+        operations.apply_operations(test_manager, to_apply)
+
+    # Whoever does the only chore is no longer on the row once someone else
+    # has been assigned it.
+    assigned = test_manager.rota[weekdays[0]].assignments[0].person.name
+    other = "Mark" if assigned == "Ryan" else "Ryan"
+    to_apply = [
+        operations.Operation(1, "assign", weekdays[0], ["Dishes", other]),
+        operations.Operation(2, "remove", weekdays[0], [assigned]),
+    ]
+    with pytest.raises(manager.PersonNotAssigned):
+        operations.apply_operations(test_manager, to_apply)
+
+    after = [str(a) for a in test_manager.rota[weekdays[0]].assignments]
+    assert after == assignments
+    assert os.path.getmtime(test_manager.rota.file_path) == modified_time
+
+
+def test_validate(test_manager, weekdays):
+    assigned = test_manager.rota[weekdays[0]].assignments[0].person.name
+    unassigned = "Mark" if assigned == "Ryan" else "Ryan"
+    far_future = datetime.date.today() + datetime.timedelta(days=3650)
+    while far_future.weekday() >= 5:
+        far_future += datetime.timedelta(days=1)
+
+    valid = [
+        operations.Operation(1, "assign", far_future, ["Dishes", "Ryan"]),
+        operations.Operation(2, "remove", weekdays[0], [assigned]),
+        operations.Operation(3, "replace", weekdays[0], [assigned, unassigned]),
+        operations.Operation(4, "train", weekdays[0], ["Dishes", unassigned]),
+    ]
+    for o in valid:
+        o.validate(test_manager)
+
+    invalid = [
+        operations.Operation(1, "remove", weekdays[0], [unassigned]),
+        operations.Operation(2, "swap", weekdays[0], [assigned, unassigned]),
+        operations.Operation(3, "replace", weekdays[0], [unassigned, assigned]),
+        operations.Operation(4, "train", far_future, ["Dishes", "Ryan"]),
+        operations.Operation(5, "assign", weekdays[0], ["Hoovering", "Ryan"]),
+    ]
+    for o in invalid:
+        with pytest.raises(operations.InvalidOperation):
+            o.validate(test_manager)
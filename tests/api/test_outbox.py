@@ -0,0 +1,79 @@
+import pytest
+import os
+import datetime
+from rotafy.api import outbox, transport
+from rotafy.config.chore import Chore
+from rotafy.config.person import Person
+from rotafy.rota import assignment
+
+
+test_chore = Chore("test_chore", 1, "every day", True, 2, 1, [])
+tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+person = Person("person", [test_chore], "1234")
+other_person = Person("other_person", [test_chore], "5678")
+
+
+@pytest.fixture
+def test_assignment():
+    return assignment.Assignment(tomorrow, test_chore, person)
+
+
+@pytest.fixture
+def test_outbox(tmp_path):
+    return outbox.Outbox(os.path.join(tmp_path, "test.outbox.json"))
+
+
+def message_for(a, recipient):
+    return transport.Message(
+        recipient.telephone, "Hi!", message_id=outbox.message_id(a, recipient)
+    )
+
+
+def test_keys(test_assignment):
+    key = outbox.assignment_key(test_assignment)
+    assert key == f"{tomorrow.isoformat()}/test_chore"
+    assert outbox.message_id(test_assignment, person) == f"{key}/person"
+
+
+def test_save_and_load(test_outbox, test_assignment):
+    test_outbox.load()
+    assert len(test_outbox.entries) == 0
+
+    key = outbox.assignment_key(test_assignment)
+    test_outbox.sync({key: [message_for(test_assignment, person)]})
+    test_outbox.start_sending(test_outbox.unsent())
+    test_outbox.attempted(test_outbox.entries.keys())
+    test_outbox.save()
+
+    loaded = outbox.Outbox(test_outbox.file_path)
+    loaded.load()
+    assert list(loaded.entries.keys()) == list(test_outbox.entries.keys())
+    e = next(iter(loaded.entries.values()))
+    assert e.assignment_key == key
+    assert e.message == message_for(test_assignment, person)
+    assert e.status == outbox.SENDING
+    assert e.attempts == 1
+
+
+def test_sync(test_outbox, test_assignment):
+    key = outbox.assignment_key(test_assignment)
+    sent = message_for(test_assignment, person)
+    failed = message_for(test_assignment, other_person)
+    assert test_outbox.delivered(key) == False
+    test_outbox.sync({key: [sent, failed]})
+    test_outbox.start_sending(test_outbox.unsent())
+    test_outbox.attempted([sent.message_id, failed.message_id])
+    test_outbox.attempted([failed.message_id, "unknown"])
+    test_outbox.reconcile({sent.message_id: "SUCCESS"})
+    assert test_outbox.entries[failed.message_id].status == outbox.FAILED
+    assert test_outbox.delivered(key) == False
+
+    test_outbox.sync({key: [sent, failed]})
+    assert test_outbox.entries[sent.message_id].status == outbox.SENT
+    assert [e.message_id for e in test_outbox.unsent()] == [failed.message_id]
+    assert test_outbox.unsent()[0].attempts == 2
+    assert test_outbox.entries[sent.message_id].attempts == 1
+
+    test_outbox.sync({})
+    assert len(test_outbox.entries) == 0
+    assert test_outbox.delivered(key) == False
@@ -0,0 +1,49 @@
+import pytest
+import json
+from rotafy.api import profiling
+
+
+@profiling.timed("double")
+def double(x):
+    profiling.count("doubled")
+    return x * 2
+
+
+def test_profiler():
+    p = profiling.Profiler()
+    with p.phase("phase"):
+        p.count("counter")
+        p.count("counter", 2)
+
+    with p.phase("phase"):
+        pass
+
+    d = p.to_dict()
+    assert d["counters"] == {"counter": 3}
+    assert d["phases"]["phase"]["calls"] == 2
+    assert d["phases"]["phase"]["seconds"] >= 0
+    assert json.loads(p.to_json()) == d
+
+
+def test_profile():
+    assert profiling.active() is None
+    assert double(2) == 4
+
+    with profiling.profile() as p:
+        assert profiling.active() is p
+        assert double(2) == 4
+        assert double(3) == 6
+        with profiling.phase("outer"):
+            profiling.count("other", 5)
+
+    assert profiling.active() is None
+    assert p.counters == {"doubled": 2, "other": 5}
+    assert p.calls["double"] == 2
+    assert p.calls["outer"] == 1
+
+
+def test_inactive():
+    with profiling.phase("nothing"):
+        profiling.count("nothing")
+
+    assert profiling.active() is None
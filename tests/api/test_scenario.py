@@ -0,0 +1,39 @@
+import pytest
+from rotafy.api import scenario
+
+
+@pytest.fixture
+def test_scenarios(tmp_path):
+    return scenario.seeded_scenarios(
+        "tests/rota/loadable_config.toml", 3, str(tmp_path), first_seed=10
+    )
+
+
+def test_seeded_scenarios(test_scenarios, tmp_path):
+    assert len(test_scenarios) == 3
+    assert [s.seed for s in test_scenarios] == [10, 11, 12]
+    for s in test_scenarios:
+        assert s.rota_directory == str(tmp_path)
+
+
+def test_run_scenario(test_scenarios, tmp_path):
+    result = scenario.run_scenario(test_scenarios[0])
+    assert result.scheduled > 0
+    assert result.assigned == result.scheduled
+    assert result.coverage == 1.0
+    assert sum(result.assignments_per_person.values()) == result.assigned
+    assert result.fairness_spread >= 0
+    assert result.fairness_stdev >= 0
+    assert result.to_dict()["seed"] == 10
+
+    repeated = scenario.run_scenario(test_scenarios[0])
+    assert repeated.assignments_per_person == result.assignments_per_person
+
+
+def test_run_scenarios(test_scenarios):
+    results = scenario.run_scenarios(test_scenarios, max_workers=2)
+    assert [r.scenario.seed for r in results] == [10, 11, 12]
+    for r in results:
+        assert r.assignments_per_person == (
+            scenario.run_scenario(r.scenario).assignments_per_person
+        )
@@ -0,0 +1,127 @@
+import pytest
+import os
+import json
+import toml
+import clicksend_client
+from unittest.mock import Mock
+from rotafy.api import transport
+from rotafy.config import config
+
+
+messages = [
+    transport.Message("1234", "Hi person!"),
+    transport.Message("5678", "Hi trainee!", "Other", "trainee"),
+]
+
+
+def write_config(tmp_path, **kwargs):
+    data = {
+        "name": "transport",
+        "chore": [{"name": "test_chore", "recurrence": "every day"}],
+        "person": [{"name": "John"}],
+    }
+    fp = os.path.join(tmp_path, "transport.toml")
+    with open(fp, "w") as f:
+        toml.dump(dict(data, **kwargs), f)
+
+    return config.Config(fp)
+
+
+def test_message():
+    assert messages[0].source == "Rotafy"
+    assert eval("transport." + repr(messages[1])) == messages[1]
+    assert messages[0] != messages[1]
+    assert messages[1].to_dict() == {
+        "id": "trainee",
+        "to": "5678",
+        "body": "Hi trainee!",
+        "source": "Other",
+    }
+
+
+def test_memory_transport():
+    t = transport.MemoryTransport()
+    assert t.send(messages) == ["SUCCESS", "SUCCESS"]
+    assert t.send([]) == []
+    assert t.sent == messages
+
+
+def test_file_transport(tmp_path):
+    fp = os.path.join(tmp_path, "outgoing", "messages.jsonl")
+    t = transport.FileTransport(fp)
+    assert t.send(messages) == ["SUCCESS", "SUCCESS"]
+    assert t.send(messages[:1]) == ["SUCCESS"]
+
+    with open(fp) as f:
+        written = [json.loads(line) for line in f]
+
+    assert written == [m.to_dict() for m in messages + messages[:1]]
+
+
+def test_clicksend_transport():
+    t = transport.ClickSendTransport("test1@test.com", "api_key")
+    assert isinstance(t.clicksend_api, clicksend_client.SMSApi)
+
+    response = {
+        "response_code": "SUCCESS",
+        "data": {
+            "messages": [
+                {"custom_string": None, "status": "SUCCESS"},
+                {"custom_string": "trainee", "status": "INVALID_RECIPIENT"},
+            ]
+        },
+    }
+    t.clicksend_api = Mock()
+    t.clicksend_api.sms_send_post.return_value = Mock(data=json.dumps(response))
+    assert t.send(messages) == ["SUCCESS", "INVALID_RECIPIENT"]
+
+    sent = t.clicksend_api.sms_send_post.call_args
+    assert sent.kwargs["_preload_content"] == False
+    assert [m.custom_string for m in sent.args[0].messages] == [None, "trainee"]
+
+
+def test_response_statuses():
+    response_messages = [
+        {"custom_string": "b", "status": "SUCCESS"},
+        {"custom_string": "a", "status": "INVALID_RECIPIENT"},
+    ]
+    with_ids = [transport.Message("1", "", message_id=i) for i in ("a", "b", "c")]
+    assert transport.response_statuses(with_ids, response_messages) == [
+        "INVALID_RECIPIENT",
+        "SUCCESS",
+        "MISSING",
+    ]
+
+    without_ids = [transport.Message("1", "") for _ in range(3)]
+    assert transport.response_statuses(without_ids, response_messages) == [
+        "SUCCESS",
+        "INVALID_RECIPIENT",
+        "MISSING",
+    ]
+
+
+def test_from_config(tmp_path):
+    assert isinstance(
+        transport.from_config(write_config(tmp_path)), transport.ClickSendTransport
+    )
+    assert isinstance(
+        transport.from_config(write_config(tmp_path, transport="Memory")),
+        transport.MemoryTransport,
+    )
+
+    file_transport = transport.from_config(
+        write_config(tmp_path, transport="file", transport_file="messages.jsonl")
+    )
+    assert isinstance(file_transport, transport.FileTransport)
+    assert file_transport.file_path == os.path.join(tmp_path, "messages.jsonl")
+
+    with pytest.raises(transport.NoTransportFile):
+        transport.from_config(write_config(tmp_path, transport="file"))
+
+    with pytest.raises(transport.UnknownTransport):
+        transport.from_config(write_config(tmp_path, transport="carrier pigeon"))
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        transport.Transport()
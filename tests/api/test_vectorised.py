@@ -0,0 +1,55 @@
+import pytest
+import datetime
+from rotafy.api import manager, vectorised
+from rotafy.config import chore, person
+from rotafy.rota import assignment, row
+
+
+dishes = chore.Chore("Dishes", 0, "Daily", False, 1, 1)
+hoovering = chore.Chore("Hoovering", 1, "Daily", False, 1, 1)
+ryan = person.Person("Ryan", [dishes, hoovering])
+mark = person.Person("Mark", [dishes, hoovering])
+today = datetime.date.today()
+tomorrow = today + datetime.timedelta(days=1)
+day_after_tomorrow = tomorrow + datetime.timedelta(days=1)
+
+
+def make_row(date, *pairs):
+    return row.Row([assignment.Assignment(date, c, p) for c, p in pairs])
+
+
+@pytest.fixture
+def previous_rows():
+    return [
+        make_row(tomorrow, (dishes, ryan), (hoovering, mark)),
+        make_row(today, (dishes, ryan)),
+    ]
+
+
+def test_history_matrix(previous_rows):
+    history = vectorised.HistoryMatrix(previous_rows, [ryan, mark], [dishes, hoovering])
+    assert history.assigned.shape == (2, 2, 2)
+    assert history.assigned[history.people[ryan], history.chores[dishes]].all()
+    assert history.penalties[history.people[ryan], history.chores[dishes]] == 0.75
+    assert history.penalties[history.people[ryan], history.chores[hoovering]] == 0.25
+    assert history.penalties[history.people[mark], history.chores[dishes]] == 0.25
+    assert history.penalties[history.people[mark], history.chores[hoovering]] == 0.5
+
+
+def test_row_weights(previous_rows):
+    candidates = [
+        make_row(day_after_tomorrow, (dishes, ryan), (hoovering, mark)),
+        make_row(day_after_tomorrow, (dishes, mark), (hoovering, ryan)),
+    ]
+    candidates = [r.assignments for r in candidates]
+    assert vectorised.row_weights(previous_rows, candidates, 2) == [0.75, 1.5]
+    assert vectorised.row_weights(previous_rows, [], 2) == []
+    assert vectorised.row_weights([], candidates, 2) == [2.0, 2.0]
+
+
+def test_matches_row_weight(tmp_path):
+    m = manager.Manager(
+        "tests/rota/loadable_config.toml", str(tmp_path), dry_run=True, seed=3
+    )
+    for r in m.rota.rows:
+        assert m.row_weights_vectorised([r]) == [m.row_weight(r)]
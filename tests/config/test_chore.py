@@ -1,5 +1,6 @@
 import pytest
 import datetime
+import pickle
 from dateutil import rrule
 from rotafy.config import chore
 
@@ -77,6 +78,78 @@ def test_next(test_chore):
     assert test_chore.next(tomorrow) == day_after_tomorrow
     assert test_chore.next(yesterday) == tomorrow
 
+    # The search carries on into the next year.
+    end_of_year = datetime.date(today.year, 12, 31)
+    new_years_day = chore.Chore("new year", 1, "every year on jan 1st", True, 1, 1)
+    assert new_years_day.next(end_of_year - datetime.timedelta(days=1)) == (
+        datetime.date(today.year + 1, 1, 1)
+    )
+
+
+def test_occurrences(test_chore):
+    today = datetime.date.today()
+    tomorrow = today + datetime.timedelta(days=1)
+    next_year = today + datetime.timedelta(days=366)
+    occurrences = test_chore.occurrences(today, next_year)
+    assert occurrences[0] == tomorrow
+    assert occurrences[-1] == next_year
+    assert len(occurrences) == 366
+    assert test_chore.occurrences(tomorrow, today) == []
+
+    # Exceptions that are not in the rule add an occurrence, as with on().
+    yesterday = today - datetime.timedelta(days=1)
+    extra_chore = chore.Chore("extra", 1, "every day", True, 2, 1, [yesterday])
+    assert extra_chore.occurrences(yesterday, today) == [yesterday, today]
+
+    limited_chore = chore.Chore("limited", 1, "fridays 3x", True, 2, 1)
+    assert len(limited_chore.occurrences(today, next_year)) == 3
+    assert limited_chore.next(next_year) is None
+
+
+def test_occurrence_cache(test_chore):
+    today = datetime.date.today()
+    test_chore.on(today)
+    hits = chore._dates_in_year.cache_info().hits
+    chore.Chore("copy", 1, test_chore._raw_recurrence, True, 2, 1).on(today)
+    assert chore._dates_in_year.cache_info().hits == hits + 1
+    assert chore._dates_in_year.cache_info().maxsize == chore.OCCURRENCE_CACHE_SIZE
+
+    copied = pickle.loads(pickle.dumps(test_chore))
+    assert copied == test_chore
+    assert copied.anchor is None
+    assert copied.occurrences(today, today) == []
+
+
+def test_anchor():
+    anchor = datetime.date(2024, 1, 1)
+    fortnightly = chore.Chore("bins", 1, "every other week", True, 1, 1, [], anchor)
+    assert fortnightly.anchor == anchor
+    for same_anchor in ("2024-01-01", datetime.datetime(2024, 1, 1, 9)):
+        same = chore.Chore("bins", 1, "every other week", True, 1, 1, [], same_anchor)
+        assert same.anchor == anchor
+
+    for invalid_anchor in ("01/01/2024", 20240101):
+        with pytest.raises(chore.InvalidAnchor):
+            chore.Chore("bins", 1, "every other week", True, 1, 1, [], invalid_anchor)
+
+    assert eval("chore." + repr(fortnightly)).anchor == anchor
+    assert fortnightly.on(anchor) == True
+    assert fortnightly.on(anchor + datetime.timedelta(days=7)) == False
+    assert fortnightly.on(anchor + datetime.timedelta(days=14)) == True
+
+    # Rules with the same recurrence and anchor are compiled once.
+    other = chore.Chore("recycling", 2, "Every other week", True, 1, 1, [], anchor)
+    assert other.recurring_rule is fortnightly.recurring_rule
+    assert chore.generate_rrule("every other week", anchor) is other.recurring_rule
+
+    # The phase does not depend on the day the chore is created.
+    today = datetime.date.today()
+    weeks_since_anchor = (today - anchor).days // 7
+    in_phase = anchor + datetime.timedelta(weeks=weeks_since_anchor + 2)
+    in_phase -= datetime.timedelta(weeks=weeks_since_anchor % 2)
+    assert fortnightly.on(in_phase) == True
+    assert fortnightly.next(in_phase) == in_phase + datetime.timedelta(days=14)
+
 
 @pytest.mark.parametrize(
     "recurrence",
@@ -274,3 +274,63 @@ def test_person_experience():
     # Test reducing experience
     p.reduce_experience("Vacuum")
     assert "Vacuum" not in p.experience
+
+
+def test_rota_directory(tmp_path, monkeypatch, bare_config):
+    monkeypatch.delenv("ROTAFY_ROTA_DIRECTORY", raising=False)
+    assert bare_config.rota_directory is None
+
+    fp = os.path.join(tmp_path, "directory.toml")
+    write_toml(dict(bare_data, rota_directory="rotas"), fp)
+    assert config.Config(fp).rota_directory == os.path.join(tmp_path, "rotas")
+
+    monkeypatch.setenv("ROTAFY_ROTA_DIRECTORY", "/tmp/rotafy")
+    assert config.Config(fp).rota_directory == "/tmp/rotafy"
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ROTAFY_ROTA_DIRECTORY", "elsewhere")
+    fp = os.path.join(tmp_path, "nested", "directory.toml")
+    os.makedirs(os.path.dirname(fp))
+    write_toml(dict(bare_data, rota_directory="rotas"), fp)
+    assert config.Config(fp).rota_directory == os.path.join(tmp_path, "elsewhere")
+
+
+def test_seed(tmp_path, bare_config):
+    assert bare_config.seed is None
+
+    fp = os.path.join(tmp_path, "seeded.toml")
+    write_toml(dict(bare_data, seed=1234), fp)
+    assert config.Config(fp).seed == 1234
+
+
+def test_retention_days(tmp_path, bare_config):
+    assert bare_config.retention_days == 365
+
+    fp = os.path.join(tmp_path, "retention.toml")
+    write_toml(dict(bare_data, retention_days=30), fp)
+    assert config.Config(fp).retention_days == 30
+
+
+def test_recurrence_anchor(tmp_path, bare_config):
+    assert all(c.anchor is None for c in bare_config.chores)
+
+    anchor = datetime.date(2024, 1, 1)
+    fp = os.path.join(tmp_path, "anchored.toml")
+    write_toml(dict(bare_data, recurrence_anchor=anchor), fp)
+    assert all(c.anchor == anchor for c in config.Config(fp).chores)
+
+    chore_anchor = datetime.date(2024, 6, 1)
+    chores = [dict(bare_data["chore"][0], anchor=chore_anchor)]
+    write_toml(dict(bare_data, recurrence_anchor=anchor, chore=chores), fp)
+    assert all(c.anchor == chore_anchor for c in config.Config(fp).chores)
+
+
+def test_transport(tmp_path, bare_config):
+    assert bare_config.transport == "clicksend"
+    assert bare_config.transport_file is None
+
+    fp = os.path.join(tmp_path, "transport.toml")
+    write_toml(dict(bare_data, transport="file", transport_file="sent.jsonl"), fp)
+    cfg = config.Config(fp)
+    assert cfg.transport == "file"
+    assert cfg.transport_file == os.path.join(tmp_path, "sent.jsonl")
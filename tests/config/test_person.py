@@ -160,6 +160,11 @@ def test_add_to_experience(test_person, new_chore):
     assert test_person.experience[new_chore] == 1
     assert new_chore not in test_person.skills
 
+    # Several sessions can be added at once
+    test_person.add_to_experience(new_chore, 2)
+    assert new_chore not in test_person.experience.keys()
+    assert new_chore in test_person.skills
+
 
 def test_reduce_experience(test_person, new_chore):
     # The chores require 2 training sessions (shadowing someone else) and 1
@@ -0,0 +1,78 @@
+import pytest
+import datetime
+import os
+from rotafy.rota import overlay, printable, row, assignment
+from rotafy.config import chore, person
+
+
+dishes = chore.Chore("Dishes", 1, "Daily", False, 1, 1)
+ryan = person.Person("Ryan", [dishes])
+mark = person.Person("Mark", [dishes])
+today = datetime.date.today()
+tomorrow = today + datetime.timedelta(days=1)
+
+
+@pytest.fixture
+def base_rota(tmp_path):
+    r = printable.PrintableRota("base_rota", str(tmp_path))
+    r.add_row(row.Row([assignment.Assignment(today, dishes, ryan)]))
+    return r
+
+
+@pytest.fixture
+def test_overlay(base_rota):
+    return overlay.OverlayRota(base_rota)
+
+
+def test_init(test_overlay, base_rota):
+    assert test_overlay.base is base_rota
+    assert test_overlay.file_path == base_rota.file_path
+    assert len(test_overlay.rows) == len(base_rota.rows)
+    assert test_overlay.rows[0] is base_rota.rows[0]
+
+
+def test_save(test_overlay):
+    test_overlay.save()
+    assert os.path.exists(test_overlay.file_path) == False
+
+
+def test_copy_on_write(test_overlay, base_rota):
+    overlay_row = test_overlay[today]
+    assert overlay_row is not base_rota[today]
+    assert test_overlay[today] is overlay_row
+
+    overlay_row[dishes] = assignment.Assignment(today, dishes, mark)
+    assert base_rota[today][dishes].person == ryan
+    assert test_overlay[today][dishes].person == mark
+
+    assert test_overlay[tomorrow] is None
+
+
+def test_diff(test_overlay, base_rota):
+    assert test_overlay.diff() == []
+
+    test_overlay[today]
+    assert test_overlay.diff() == []
+
+    test_overlay.add_row(row.Row([assignment.Assignment(tomorrow, dishes, mark)]))
+    test_overlay[today][dishes] = assignment.Assignment(today, dishes, mark)
+    changes = test_overlay.diff()
+    assert [c[0] for c in changes] == [today, tomorrow]
+    assert changes[0][1] is base_rota[today]
+    assert changes[1][1] is None
+
+    del test_overlay[today]
+    assert test_overlay.diff()[0][2] is None
+    assert len(base_rota.rows) == 1
+
+
+def test_describe_diff(test_overlay):
+    assert overlay.describe_diff([]) == ""
+
+    test_overlay[today][dishes] = assignment.Assignment(today, dishes, mark)
+    description = overlay.describe_diff(test_overlay.diff())
+    assert description.splitlines() == [
+        printable.human_readable_date(today, True),
+        "  - Dishes: Ryan",
+        "  + Dishes: Mark",
+    ]
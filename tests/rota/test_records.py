@@ -0,0 +1,85 @@
+import pytest
+import datetime
+import json
+from rotafy.rota import assignment, records, rota, row
+from rotafy.config import chore, person
+
+
+dishes = chore.Chore("Dishes", 1, "Daily", False, 5, 5)
+hoovering = chore.Chore("Hoovering", 2, "Daily", False, 5, 5)
+ryan = person.Person("Ryan", [dishes, hoovering])
+mark = person.Person("Mark", [dishes], training=[hoovering])
+matthew = person.Person("Matthew", [dishes])
+chores = [dishes, hoovering]
+people = [ryan, mark, matthew]
+today = datetime.date.today()
+tomorrow = today + datetime.timedelta(days=1)
+
+
+@pytest.fixture
+def source_rota(tmp_path):
+    r = rota.Rota("source_rota", str(tmp_path))
+    r.add_row(
+        row.Row(
+            [
+                assignment.Assignment(today, dishes, matthew),
+                assignment.Assignment(today, hoovering, ryan, mark, True),
+            ]
+        )
+    )
+    r.add_row(row.Row([assignment.Assignment(tomorrow, dishes, mark)]))
+    return r
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+def test_round_trip(tmp_path, source_rota, extension):
+    file_path = str(tmp_path / f"records{extension}")
+    assert records.write_records(source_rota.iter_assignments(), file_path) == 3
+
+    target_rota = rota.Rota("target_rota", str(tmp_path))
+    imported = records.import_records(
+        target_rota, records.read_records(file_path), chores, people
+    )
+    assert imported == 2
+    assert [r.assignments for r in target_rota.rows] == [
+        r.assignments for r in source_rota.rows
+    ]
+    assert target_rota[today][hoovering].notification_sent == True
+    assert target_rota[today][dishes].notification_sent == False
+
+    reloaded_rota = rota.Rota("target_rota", str(tmp_path))
+    assert len(reloaded_rota.rows) == 2
+
+
+def test_merge(source_rota):
+    new_rows = records.build_rows(
+        source_rota,
+        [{"date": str(tomorrow), "chore": "hoovering", "person": "ryan"}],
+        chores,
+        people,
+    )
+    assert len(new_rows) == 1
+    assert new_rows[0][dishes].person == mark
+    assert new_rows[0][hoovering].person == ryan
+
+
+def test_invalid_records(tmp_path, source_rota):
+    invalid = [
+        {"date": "tomorrow", "chore": "Dishes", "person": "Ryan"},
+        {"date": str(today), "chore": "Cooking", "person": "Ryan"},
+        {"date": str(today), "chore": "Dishes", "person": "Nobody"},
+        {"date": str(today), "chore": "Hoovering", "person": "Mark"},
+        {"date": str(tomorrow), "chore": "Dishes", "person": "Ryan"},
+        {"date": str(tomorrow), "chore": "Hoovering", "person": "Ryan"},
+        {"date": str(today), "chore": "Dishes", "person": "Matthew"},
+        {"date": str(today), "chore": "dishes", "person": "Matthew"},
+    ]
+    with pytest.raises(records.InvalidRecords) as e:
+        records.import_records(source_rota, invalid, chores, people)
+
+    assert [n for n, _ in e.value.errors] == [1, 2, 3, 4, 5, 8]
+    assert len(source_rota.rows) == 2
+    assert source_rota[tomorrow][dishes].person == mark
+
+    with pytest.raises(records.UnsupportedRecordsFile):
+        list(records.read_records(str(tmp_path / "records.json")))
@@ -0,0 +1,46 @@
+import pytest
+import datetime
+import os
+from rotafy.rota import assignment, printable, rendering, row
+from rotafy.config import chore, person
+
+
+dishes = chore.Chore("Dishes", 1, "Daily", False, 1, 1)
+ryan = person.Person("Ryan", [dishes])
+today = datetime.date.today()
+
+
+@pytest.fixture
+def test_printable(tmp_path):
+    r = printable.PrintableRota("test_printable", str(tmp_path))
+    for days in range(45):
+        date = today + datetime.timedelta(days=days)
+        r.add_row(row.Row([assignment.Assignment(date, dishes, ryan)]))
+
+    return r
+
+
+def test_month_jobs(tmp_path, test_printable):
+    end = today + datetime.timedelta(days=44)
+    jobs = rendering.month_jobs(test_printable, str(tmp_path), today, end)
+    assert len(jobs) in (2, 3)
+    assert sum(len(j.dataframe) for j in jobs) == 45
+    assert jobs[0].output_file == os.path.join(
+        tmp_path, f"test_printable-{today.strftime('%Y-%m')}.pdf"
+    )
+
+
+def test_render(tmp_path, test_printable):
+    empty_printable = printable.PrintableRota("empty_printable", str(tmp_path))
+    output_directory = str(tmp_path / "pdfs")
+    rendered = rendering.render_rotas(
+        [test_printable, empty_printable], output_directory, max_workers=2
+    )
+    assert rendered == [os.path.join(output_directory, "test_printable.pdf"), None]
+    assert os.listdir(output_directory) == ["test_printable.pdf"]
+
+    end = today + datetime.timedelta(days=44)
+    rendered = rendering.render_months(
+        test_printable, output_directory, today, end, max_workers=2
+    )
+    assert all(os.path.exists(fp) for fp in rendered)
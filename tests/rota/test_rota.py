@@ -58,11 +58,15 @@ def sample_assignment(sample_chore, sample_person):
     )
 
 
-def test_init(test_rota):
+def test_init(tmp_path, test_rota):
     assert test_rota.name == "test_rota"
     assert "test_rota.pkl" in test_rota.file_path
+    assert os.path.dirname(test_rota.file_path) == rota.DEFAULT_DIRECTORY
     assert len(test_rota.rows) == 0
 
+    stored_rota = rota.Rota("stored_rota", str(tmp_path))
+    assert stored_rota.file_path == os.path.join(tmp_path, "stored_rota.pkl")
+
 
 def test_get_item(test_rota, loadable_rota):
     today = datetime.date.today()
@@ -119,10 +123,12 @@ def test_load(test_rota, loadable_rota):
         loadable_rota_data = pickle.load(f)
 
     loadable_rota.load()
-    assert len(loadable_rota.rows) == len(loadable_rota_data)
+    assert len(loadable_rota.rows) == len(loadable_rota_data["rows"])
     for x in loadable_rota.rows:
         assert isinstance(x, row.Row)
 
+    assert loadable_rota.training == loadable_rota_data["training"]
+
 
 def test_save(test_rota, loadable_rota):
     current_modified_time = os.path.getmtime(loadable_rota.file_path)
@@ -353,3 +359,296 @@ def test_printable_rota_save_load(tmp_path, sample_assignment):
     assert loaded_rota[test_date] is not None
     assert loaded_rota[test_date].assignments[0].chore.name == sample_assignment.chore.name
     assert loaded_rota[test_date].assignments[0].person.name == sample_assignment.person.name
+
+
+def test_lock(tmp_path, test_rota):
+    test_rota.file_path = str(tmp_path / "test_rota.pkl")
+    with test_rota.lock():
+        with test_rota.lock():
+            assert test_rota._lock_depth == 2
+
+        assert test_rota._lock_depth == 1
+
+    assert test_rota._lock_depth == 0
+    assert test_rota._lock_file is None
+    assert os.path.isfile(test_rota.file_path + ".lock")
+
+
+def test_save_atomic(tmp_path, test_rota, test_row):
+    test_rota.file_path = str(tmp_path / "test_rota.pkl")
+    test_rota.add_row(test_row)
+    test_rota.save()
+    test_rota.save()
+    leftover = [f for f in os.listdir(tmp_path) if f.endswith(".lock") == False]
+    assert leftover == ["test_rota.pkl"]
+
+
+def test_save_modified(tmp_path, test_row):
+    file_path = str(tmp_path / "test_rota.pkl")
+    first = rota.Rota("test_rota")
+    first.file_path = file_path
+    first.load()
+    second = rota.Rota("test_rota")
+    second.file_path = file_path
+    second.load()
+
+    first.add_row(test_row)
+    first.save()
+    assert second.is_stale()
+    with pytest.raises(rota.RotaModified):
+        second.save()
+
+    second.load()
+    assert second.is_stale() == False
+    second.save()
+    assert len(second.rows) == 1
+
+
+def test_add_row_logging(caplog, test_rota, test_row):
+    with caplog.at_level("ERROR", logger=rota.__name__):
+        test_rota.add_row(test_row)
+
+    assert len(caplog.records) == 0
+
+    with caplog.at_level("INFO", logger=rota.__name__):
+        test_rota.add_row(test_row)
+
+    assert "Adding row Dishes: Ryan" in caplog.text
+
+
+def test_training_counts(tmp_path):
+    c = chore.Chore("Dishes", 1, "Daily", False, 2, 2)
+    p = person.Person("Ryan", [c])
+    t = person.Person("Mark", [], training=[c])
+    today = datetime.date.today()
+    rows = [
+        row.Row([assignment.Assignment(today + datetime.timedelta(days=i), c, p, t)])
+        for i in range(3)
+    ]
+
+    legacy_path = tmp_path / "legacy_rota.pkl"
+    with open(legacy_path, "wb") as f:
+        pickle.dump(rows, f)
+
+    legacy_rota = rota.Rota("legacy_rota", str(tmp_path))
+    assert len(legacy_rota.rows) == 3
+    assert legacy_rota.training == {"Mark": {"Dishes": 3}}
+
+    legacy_rota.delete_row(today)
+    assert legacy_rota.training == {"Mark": {"Dishes": 2}}
+
+    tomorrow = today + datetime.timedelta(days=1)
+    legacy_rota.set_assignment(assignment.Assignment(tomorrow, c, p))
+    assert legacy_rota.training == {"Mark": {"Dishes": 1}}
+    assert legacy_rota.training == legacy_rota.training_counts()
+
+    legacy_rota.save()
+    with open(legacy_path, "rb") as f:
+        saved = pickle.load(f)
+
+    assert len(saved["rows"]) == 2
+    assert saved["training"] == {"Mark": {"Dishes": 1}}
+
+    # Saved counters are used as they are rather than counted from the rows.
+    saved["training"] = {"Mark": {"Dishes": 7}}
+    with open(legacy_path, "wb") as f:
+        pickle.dump(saved, f)
+
+    reloaded_rota = rota.Rota("legacy_rota", str(tmp_path))
+    assert reloaded_rota.training == {"Mark": {"Dishes": 7}}
+
+
+def test_compact(tmp_path):
+    c = chore.Chore("Dishes", 1, "Daily", False, 5, 5)
+    p = person.Person("Ryan", [c])
+    t = person.Person("Mark", [], training=[c])
+    today = datetime.date.today()
+    compacted_rota = rota.Rota("compacted_rota", str(tmp_path))
+    for i in range(25):
+        date = today + datetime.timedelta(days=i)
+        compacted_rota.add_row(row.Row([assignment.Assignment(date, c, p, t)]))
+
+    # Chores can only be assigned from today, so move the rows into the past.
+    for r in compacted_rota.rows:
+        r.date -= datetime.timedelta(days=20)
+        for a in r.assignments:
+            a.date -= datetime.timedelta(days=20)
+
+    compacted_rota.save()
+    training = compacted_rota.training_counts()
+    assert compacted_rota.compact(today, keep=5) == 15
+    assert len(compacted_rota.rows) == 10
+    assert compacted_rota.rows[0].date == today - datetime.timedelta(days=5)
+    assert compacted_rota.training_counts() == training
+    assert compacted_rota.compact(today, keep=5) == 0
+
+    reloaded_rota = rota.Rota("compacted_rota", str(tmp_path))
+    assert len(reloaded_rota.rows) == 10
+    assert reloaded_rota.training == training
+    archived = list(reloaded_rota.archived_rows())
+    assert [r.date for r in archived] == [
+        today + datetime.timedelta(days=i) for i in range(-20, -5)
+    ]
+
+    assert reloaded_rota.compact(today) == 5
+    assert len(list(reloaded_rota.archived_rows())) == 20
+    assert reloaded_rota.training_counts() == training
+
+
+def test_iter_rows(tmp_path):
+    dishes = chore.Chore("Dishes", 1, "Daily", False, 5, 5)
+    hoovering = chore.Chore("Hoovering", 2, "Daily", False, 5, 5)
+    ryan = person.Person("Ryan", [dishes, hoovering])
+    mark = person.Person("Mark", [dishes], training=[hoovering])
+    matthew = person.Person("Matthew", [dishes])
+    today = datetime.date.today()
+    streamed_rota = rota.Rota("streamed_rota", str(tmp_path))
+    for i in range(10):
+        date = today + datetime.timedelta(days=i)
+        if i % 2 == 0:
+            assignments = [
+                assignment.Assignment(date, dishes, mark),
+                assignment.Assignment(date, hoovering, ryan),
+            ]
+        else:
+            assignments = [
+                assignment.Assignment(date, dishes, matthew),
+                assignment.Assignment(date, hoovering, ryan, mark),
+            ]
+
+        streamed_rota.add_row(row.Row(assignments))
+
+    for r in streamed_rota.rows:
+        r.date -= datetime.timedelta(days=5)
+        for a in r.assignments:
+            a.date -= datetime.timedelta(days=5)
+
+    streamed_rota.save()
+    streamed_rota.compact(today)
+    assert len(streamed_rota.rows) == 5
+
+    all_dates = [r.date for r in streamed_rota.iter_rows()]
+    assert all_dates == [today + datetime.timedelta(days=i - 5) for i in range(10)]
+
+    start = today - datetime.timedelta(days=2)
+    end = today + datetime.timedelta(days=1)
+    ranged_dates = [r.date for r in streamed_rota.iter_rows(start, end)]
+    assert ranged_dates == [start + datetime.timedelta(days=i) for i in range(4)]
+    assert list(streamed_rota.iter_rows(today)) == streamed_rota.rows
+
+    hoovering_assignments = list(streamed_rota.iter_assignments(chore_name="Hoovering"))
+    assert len(hoovering_assignments) == 10
+    assert all(a.person.name == "Ryan" for a in hoovering_assignments)
+
+    mark_assignments = list(streamed_rota.iter_assignments(person_name="Mark"))
+    assert len(mark_assignments) == 10
+    mark_training = list(
+        streamed_rota.iter_assignments(person_name="Mark", chore_name="Hoovering")
+    )
+    assert [a.trainee.name for a in mark_training] == ["Mark"] * 5
+
+
+def test_indexes(tmp_path):
+    dishes = chore.Chore("Dishes", 1, "Daily", False, 5, 5)
+    hoovering = chore.Chore("Hoovering", 2, "Daily", False, 5, 5)
+    ryan = person.Person("Ryan", [dishes, hoovering])
+    mark = person.Person("Mark", [dishes], training=[hoovering])
+    today = datetime.date.today()
+    dates = [today + datetime.timedelta(days=i) for i in range(6)]
+    indexed_rota = rota.Rota("indexed_rota", str(tmp_path))
+    for date in reversed(dates):
+        indexed_rota.add_row(row.Row([assignment.Assignment(date, dishes, ryan)]))
+
+    assert [r.date for r in indexed_rota.rows] == dates
+    assert indexed_rota.person_dates("Ryan") == dates
+    assert indexed_rota.person_dates("Ryan", dates[1], dates[3]) == dates[1:4]
+    assert indexed_rota.chore_dates("Dishes", start=dates[4]) == dates[4:]
+    assert indexed_rota.person_dates("Mark") == []
+
+    indexed_rota.set_assignment(assignment.Assignment(dates[2], dishes, mark))
+    indexed_rota.set_assignment(assignment.Assignment(dates[2], hoovering, ryan))
+    assert indexed_rota.person_dates("Mark") == [dates[2]]
+    assert indexed_rota.chore_dates("Hoovering") == [dates[2]]
+    assert len(indexed_rota.person_assignments("Mark")) == 1
+    assert [a.date for a in indexed_rota.chore_assignments("Dishes")] == dates
+
+    indexed_rota.delete_assignment(dates[2], hoovering)
+    indexed_rota.delete_row(dates[0])
+    assert indexed_rota.person_dates("Ryan") == dates[1:2] + dates[3:]
+    assert indexed_rota.chore_dates("Hoovering") == []
+    assert indexed_rota[dates[0]] is None
+    assert indexed_rota.rows_prior(dates[3]) == indexed_rota.rows[:2]
+    assert indexed_rota.rows_after(dates[3], True) == indexed_rota.rows[2:]
+
+    # Changing rows directly needs a sort to rebuild the indexes.
+    indexed_rota.rows[0].assignments[0].person = mark
+    indexed_rota.sort()
+    assert indexed_rota.person_dates("Mark") == dates[1:3]
+
+    indexed_rota.delete_assignment(dates[1], dishes)
+    assert indexed_rota.person_dates("Mark") == [dates[2]]
+    assert indexed_rota.latest_date == dates[-1]
+
+
+def test_unsent_assignments(tmp_path):
+    dishes = chore.Chore("Dishes", 1, "Daily", 1, 5, 5)
+    hoovering = chore.Chore("Hoovering", 2, "Daily", 2, 5, 5)
+    ryan = person.Person("Ryan", [dishes, hoovering])
+    mark = person.Person("Mark", [dishes])
+    today = datetime.date.today()
+    dates = [today + datetime.timedelta(days=i) for i in range(4)]
+    unsent_rota = rota.Rota("unsent_rota", str(tmp_path))
+    for date in dates:
+        unsent_rota.add_row(
+            row.Row(
+                [
+                    assignment.Assignment(date, dishes, mark, None, True),
+                    assignment.Assignment(date, hoovering, ryan),
+                ]
+            )
+        )
+
+    unsent = unsent_rota.unsent_assignments()
+    assert [a.date for a in unsent] == dates
+    assert all(a.chore == hoovering for a in unsent)
+    assert len(unsent_rota.unsent_assignments(dates[1], dates[2])) == 2
+
+    unsent[0].mark_notified()
+    assert [a.date for a in unsent_rota.unsent_assignments()] == dates[1:]
+    assert unsent_rota._unsent == dates[1:]
+
+    unsent_rota.delete_assignment(dates[1], hoovering)
+    unsent_rota.set_assignment(assignment.Assignment(dates[0], dishes, mark))
+    assert [a.date for a in unsent_rota.unsent_assignments()] == dates[:1] + dates[2:]
+    assert unsent_rota.unsent_assignments(dates[0], dates[0])[0].chore == dishes
+
+
+def test_journal(tmp_path):
+    c = chore.Chore("Dishes", 1, "Daily", False, 1, 1)
+    p = person.Person("Ryan", [c])
+    today = datetime.date.today()
+    tomorrow = today + datetime.timedelta(days=1)
+    later = today + datetime.timedelta(days=5)
+    r = rota.Rota("journal_rota", str(tmp_path))
+    r.rows = [
+        row.Row([assignment.Assignment(today + datetime.timedelta(days=i), c, p)])
+        for i in range(3)
+    ]
+    before = [(x.date, [str(a) for a in x.assignments]) for x in r.rows]
+
+    with pytest.raises(ValueError):
+        with r.journal():
+            r.delete_row(today)
+            r.add_row(row.Row([assignment.Assignment(later, c, p)]))
+            r[tomorrow].assignments[0].notification_sent = True
+            assert len(r._journal) == 3
+            raise ValueError
+
+    assert [(x.date, [str(a) for a in x.assignments]) for x in r.rows] == before
+    assert r[tomorrow].assignments[0].notification_sent == False
+    assert r._journal is None
+
+    with r.journal():
+        r.delete_row(today)
+
+    assert r[today] is None